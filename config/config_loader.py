@@ -68,7 +68,11 @@ class Config:
                 "highlight_color": [0.48, 0.74, 0.91],
                 "thickness_factor": 0.7,
                 "end_padding_factor": 0.45,
-                "show_solutions": True
+                "show_solutions": True,
+                "compact": False,
+                "compact_tiles": 2,
+                "compact_gap": 0.25,
+                "compact_caption_size": 14
             },
             "page_number": {
                 "show": True,
@@ -97,12 +101,27 @@ class Config:
                 "grid_size": 25,
                 "seed": 42,
                 "min_words_per_puzzle": 8,
-                "max_word_length": 25
+                "max_word_length": 25,
+                "fill_mode": "random",
+                "letter_profile": "uniform",
+                "placement": "length",
+                "banned_words": [],
+                "difficulty": None,
+                "difficulty_attempts": 24,
+                "puzzle_time_budget": None,
+                "puzzle_op_budget": None,
+                "book_time_budget": None,
+                "book_op_budget": None,
+                "drop_unplaceable_words": False
             },
             "general": {
                 "font_path": "BiskiTrial-Regular.ttf",
+                "display_font_path": None,
+                "text_font_path": None,
                 "output_file": "winter_word_search.pdf",
-                "puzzle_data": "puzzle_bank_no_duplicates.json"
+                "puzzle_data": "puzzle_bank_no_duplicates.json",
+                "compression": "fast",
+                "optimize_pdf": False
             }
         }
     
@@ -2,57 +2,51 @@ from __future__ import annotations
 
 import argparse
 import json
-from collections import Counter
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List
 
-# REMOVE this:
-# from .puzzle_bank import PUZZLES
+from .dedup import CONTAINS, NEAR, DedupEngine, dedupe_entries, exact_key, iter_bank
+from .word_index import WordIndex
 
-# NEW: load puzzles from puzzle_bank_clean.json next to this file
 BASE_DIR = Path(__file__).resolve().parent
-PUZZLES: List[dict] = json.loads(
-     (BASE_DIR.parent / "8-10_clean.json").read_text(encoding="utf-8")
-    # (BASE_DIR / "8-10_clean.json").read_text(encoding="utf-8")
-)
+DEFAULT_BANK = BASE_DIR.parent / "8-10_clean.json"
+DEFAULT_INDEX = BASE_DIR.parent / ".cache" / "word_index.sqlite"
 
 
 def normalize(word: str) -> str:
     """Upper-case and strip spaces so duplicates are caught reliably."""
-    return word.strip().upper()
-
-
-def build_cleaned_puzzles() -> List[dict]:
-    """Return a copy of PUZZLES with duplicate words removed globally."""
-    seen: set[str] = set()
-    cleaned = []
-    for entry in PUZZLES:
-        unique_words = []
-        for word in entry["words"]:
-            key = normalize(word)
-            if key in seen:
-                continue
-            seen.add(key)
-            unique_words.append(word)
-        cleaned.append({"theme": entry["theme"], "words": unique_words})
-    return cleaned
-
-
-def analyze() -> dict:
-    """Return statistics and duplicate list."""
-    word_counter: Counter[str] = Counter()
-    for entry in PUZZLES:
-        word_counter.update(normalize(word) for word in entry["words"])
-
-    duplicates = sorted(
-        [(word, count) for word, count in word_counter.items() if count > 1],
-        key=lambda item: (-item[1], item[0]),
-    )
+    return exact_key(word)
+
+
+def build_cleaned_puzzles(entries: Iterable[dict]) -> List[dict]:
+    """Return a copy of the entries with duplicate words removed globally."""
+    return list(dedupe_entries(entries))
+
+
+def collect_themes(entries: Iterable[dict], found: Dict[str, List[str]]) -> Iterator[dict]:
+    """Pass entries through, appending each theme that uses a word of ``found`` to its list."""
+    for entry in entries:
+        for key in {normalize(word) for word in entry["words"]} & found.keys():
+            found[key].append(entry["theme"])
+        yield entry
+
+
+def analyze(entries: Iterable[dict], near: bool = False, containment: bool = False) -> dict:
+    """Return statistics, the duplicate list and (optionally) near/containment findings."""
+    engine = DedupEngine(near=near, containment=containment)
+    flagged = {NEAR: [], CONTAINS: []}
+    for _, entry_findings in engine.feed(entries):
+        for finding in entry_findings:
+            if finding.kind in flagged:
+                flagged[finding.kind].append(finding)
+
     return {
-        "theme_count": len(PUZZLES),
-        "total_words": sum(len(entry["words"]) for entry in PUZZLES),
-        "unique_words": len(word_counter),
-        "duplicates": duplicates,
+        "theme_count": engine.theme_count,
+        "total_words": engine.total_words,
+        "unique_words": engine.unique_words,
+        "duplicates": engine.duplicates(),
+        "near": flagged[NEAR],
+        "contains": flagged[CONTAINS],
     }
 
 
@@ -60,14 +54,49 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description="Analyze puzzle bank entries, list duplicates, and optionally write a cleaned copy."
     )
+    parser.add_argument(
+        "bank",
+        type=Path,
+        nargs="?",
+        default=DEFAULT_BANK,
+        help="Bank to analyze: a JSON list or JSONL of {theme, words} entries.",
+    )
     parser.add_argument(
         "--write-clean",
         type=Path,
-        help="Optional path to write a deduplicated JSON copy of PUZZLES.",
+        help="Optional path to write a deduplicated JSON copy of the bank.",
     )
+    parser.add_argument("--near", action="store_true",
+                        help="Also list near duplicates (spacing, punctuation, plural/suffix variants).")
+    parser.add_argument("--containment", action="store_true",
+                        help="Also list words spelled inside another word of the same theme.")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX,
+                        help="Persistent word index; only themes changed since the last run are re-read.")
+    parser.add_argument("--no-index", action="store_true", help="Recount the whole bank without the index.")
+    parser.add_argument("--lookup", action="append", default=[], metavar="WORD",
+                        help="Print the themes using WORD (repeatable).")
     args = parser.parse_args()
 
-    stats = analyze()
+    if args.no_index:
+        found = {normalize(word): [] for word in args.lookup}
+        stats = analyze(collect_themes(iter_bank(args.bank), found), args.near, args.containment)
+        for key, themes in found.items():
+            print(f"{key}: {', '.join(themes) if themes else 'not in bank'}")
+    else:
+        with WordIndex(args.index) as index:
+            update = index.update(args.bank)
+            state = ("unchanged" if update.unchanged_file
+                     else f"{update.changed}/{update.themes} themes re-indexed, {update.removed} removed")
+            print(f"[analyze_words] Index {args.index.name}: {state} ({update.seconds * 1000:.0f} ms)")
+            stats = index.stats(args.bank)
+            for word in args.lookup:
+                themes = index.themes_for(args.bank, word)
+                print(f"{normalize(word)}: {', '.join(themes) if themes else 'not in bank'}")
+        if args.near or args.containment:
+            stats.update({key: value for key, value in analyze(iter_bank(args.bank), args.near,
+                                                               args.containment).items()
+                          if key in (NEAR, CONTAINS)})
+
     print(f"Total themes: {stats['theme_count']}")
     print(f"Total words (with duplicates): {stats['total_words']}")
     print(f"Unique words: {stats['unique_words']}")
@@ -75,8 +104,17 @@ def main() -> None:
     for word, count in stats["duplicates"]:
         print(f"  {word} ×{count}")
 
+    if args.near:
+        print(f"Near duplicates ({len(stats['near'])} entries):")
+        for finding in stats["near"]:
+            print(f"  {finding.word} ({finding.theme}) ~ {finding.other_word} ({finding.other_theme})")
+    if args.containment:
+        print(f"Contained words ({len(stats['contains'])} entries):")
+        for finding in stats["contains"]:
+            print(f"  {finding.word} in {finding.other_word} ({finding.theme})")
+
     if args.write_clean:
-        cleaned = build_cleaned_puzzles()
+        cleaned = build_cleaned_puzzles(iter_bank(args.bank))
         args.write_clean.write_text(json.dumps(cleaned, indent=2))
         print(f"\nClean copy written to {args.write_clean}")
 
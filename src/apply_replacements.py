@@ -1,7 +1,17 @@
+from __future__ import annotations
+
+import argparse
 import json
+import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from collections import defaultdict
-from src.replacements import REPLACEMENTS as MANUAL_REPLACEMENTS
+from typing import Dict, Iterator, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config.config_loader import Config
+from .dedup import DedupEngine, exact_key, iter_bank, letters_key
+from .replacements import REPLACEMENTS as MANUAL_REPLACEMENTS
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -9,14 +19,20 @@ BASE_DIR = Path(__file__).resolve().parent
 INPUT = BASE_DIR / "puzzle_bank_data.json"
 OUTPUT = BASE_DIR / "puzzle_bank_clean.json"
 
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
 
-def build_word_theme_index(data):
-    """Map each word -> list of themes it appears in."""
-    word_to_themes = defaultdict(list)
-    for block in data:
-        theme = block["theme"]
-        for w in block["words"]:
-            word_to_themes[w].append(theme)
+
+def build_word_theme_index(data, engine=None):
+    """Map each duplicated word -> list of themes it appears in, owner first.
+
+    One pass over the bank; pass ``engine`` to keep its word counts (every
+    normalized word of the bank) for collision checks afterwards.
+    """
+    engine = engine or DedupEngine(near=False, containment=False)
+    word_to_themes = {}
+    for _, findings in engine.feed(data):
+        for finding in findings:
+            word_to_themes.setdefault(finding.other_word, [finding.other_theme]).append(finding.theme)
     return word_to_themes
 
 
@@ -32,40 +48,136 @@ def slugify_theme(theme: str) -> str:
     return (slug[-12:] or slug).lower()
 
 
-def build_auto_replacements(data):
+def theme_suffixes(theme: str) -> List[str]:
+    """
+    Suffix candidates for a theme, best first: its words from the last one
+    back ('Winter Mountaineering' -> 'mountaineering', 'winter'), then the
+    slug.
+    """
+    words = ["".join(ch for ch in part if ch.isalpha()).lower() for part in theme.split()]
+    suffixes = [word for word in reversed(words) if word]
+    slug = slugify_theme(theme)
+    if slug and slug not in suffixes:
+        suffixes.append(slug)
+    return suffixes
+
+
+def alpha_tag(n: int) -> str:
+    """0 -> 'a', 25 -> 'z', 26 -> 'ba': letter-only counters for grid words."""
+    tag = ALPHABET[n % 26]
+    while n >= 26:
+        n //= 26
+        tag = ALPHABET[n % 26] + tag
+    return tag
+
+
+def default_max_length() -> int:
+    """Longest word a puzzle can hold: max_word_length, capped by the grid size."""
+    config = Config("config/config.json")
+    limits = [config.get('puzzle_generation', 'max_word_length'), config.get('puzzle_generation', 'grid_size')]
+    return min(int(limit) for limit in limits if limit)
+
+
+@dataclass
+class ReplacementPlan:
+    replacements: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    groups: int = 0       # words shared by several themes
+    duplicates: int = 0   # (word, theme) pairs that need a new word
+    manual: int = 0       # of those, covered by REPLACEMENTS
+    repeats: int = 0      # extra copies inside one theme: dropped by transform
+    unresolved: List[Tuple[str, str]] = field(default_factory=list)  # no room left for a suffix
+    seconds: float = 0.0
+
+
+class CandidatePool:
+    """Hands out bank-unique replacement words, deterministically.
+
+    Candidates are compared by their letters (how they appear in the grid),
+    so 'ice axe' and 'iceaxe' count as taken together. Suffixes are only
+    used whole: one that would have to be cut is skipped, and the counter
+    fallback drops the suffix rather than clip it. Each word's counter
+    resumes where it stopped, so a run never retries a candidate.
+    """
+
+    def __init__(self, taken, max_length: int) -> None:
+        self.taken = {letters_key(word) for word in taken}
+        self.max_length = max_length
+        self.next_tag: Dict[str, int] = {}
+
+    def candidates(self, word: str, theme: str) -> Iterator[str]:
+        budget = self.max_length - len(letters_key(word))
+        if budget <= 0:
+            return
+        fitting = [suffix for suffix in theme_suffixes(theme) if len(suffix) <= budget]
+        for suffix in fitting:
+            yield f"{word}{suffix}"
+        # Counter fallback: '<word><suffix><tag>', or '<word><tag>' once the
+        # best fitting suffix leaves no room for the tag.
+        head = fitting[0] if fitting else ""
+        key = letters_key(word)
+        while True:
+            n = self.next_tag.get(key, 0)
+            self.next_tag[key] = n + 1
+            tag = alpha_tag(n)
+            if len(tag) > budget:
+                return
+            yield f"{word}{head if len(head) + len(tag) <= budget else ''}{tag}"
+
+    def claim(self, word: str, theme: str) -> str | None:
+        for candidate in self.candidates(word, theme):
+            key = letters_key(candidate)
+            if key not in self.taken:
+                self.taken.add(key)
+                return candidate
+        return None
+
+
+def build_auto_replacements(data, manual=None, max_length=None) -> ReplacementPlan:
     """
     For every word that appears in multiple themes, create replacements
-    for all *but the first* theme.
+    for all *but the first* theme, skipping pairs that ``manual`` covers.
 
     Example: 'alpine' in 3 themes ->
       first theme keeps 'alpine'
       others get 'alpinemountaineering', 'alpineclimbing', etc.
-    """
-    word_to_themes = build_word_theme_index(data)
-    auto = {}
-    # collect all existing words to avoid collisions
-    all_words = set()
-    for block in data:
-        all_words.update(block["words"])
 
+    A suffix is cut so the replacement stays within ``max_length`` letters;
+    when even that collides, a letter counter is appended. A word repeated
+    inside one theme needs no replacement: ``transform`` drops the copies.
+    """
+    started = time.perf_counter()
+    manual = manual or {}
+    max_length = max_length or default_max_length()
+    engine = DedupEngine(near=False, containment=False)
+    word_to_themes = build_word_theme_index(data, engine)
+
+    # Existing words and hand-made replacements are both off limits.
+    pool = CandidatePool(list(engine.counts) + [new for theme_map in manual.values() for new in theme_map.values()],
+                         max_length)
+    plan = ReplacementPlan(groups=len(word_to_themes))
     for word, themes in word_to_themes.items():
-        if len(themes) <= 1:
-            continue
-
-        owner = themes[0]  # first theme keeps original
+        manual_map = manual.get(word.upper(), {})
         theme_map = {}
-        for theme in themes[1:]:
-            base_slug = slugify_theme(theme)
-            candidate = f"{word}{base_slug}"  # e.g. 'alpine' + 'mountaineering'
-            # ensure uniqueness
-            while candidate in all_words:
-                candidate += "x"
-            all_words.add(candidate)
+        seen = {themes[0]}
+        for theme in themes[1:]:  # first theme keeps original
+            if theme in seen:
+                plan.repeats += 1
+                continue
+            seen.add(theme)
+            plan.duplicates += 1
+            if theme in manual_map:
+                plan.manual += 1
+                continue
+            candidate = pool.claim(word, theme)
+            if candidate is None:
+                plan.unresolved.append((word, theme))
+                continue
             theme_map[theme] = candidate
+        if theme_map:
+            plan.replacements[word.upper()] = theme_map
 
-        auto[word.upper()] = theme_map
-
-    return auto
+    plan.seconds = time.perf_counter() - started
+    return plan
 
 
 def merge_replacements(auto, manual):
@@ -82,28 +194,44 @@ def merge_replacements(auto, manual):
 
 
 def transform(data, replacements):
-    """Apply replacements to the JSON data."""
+    """Apply replacements to the JSON data.
+
+    Later copies of a word inside one theme (by name, across entries) are
+    dropped, so a theme never ends up with the same replacement (or
+    original) twice.
+    """
+    kept_by_theme = {}
     for block in data:
         theme = block["theme"]
         new_words = []
+        kept = kept_by_theme.setdefault(theme, set())
         for w in block["words"]:
-            key = w.upper()
+            key = exact_key(w)
             if key in replacements and theme in replacements[key]:
-                new_words.append(replacements[key][theme])
-            else:
-                new_words.append(w)
+                w = replacements[key][theme]
+            if letters_key(w) in kept:
+                continue
+            kept.add(letters_key(w))
+            new_words.append(w)
         block["words"] = new_words
     return data
 
 
 def main():
-    data = json.loads(INPUT.read_text(encoding="utf-8"))
+    parser = argparse.ArgumentParser(description="Rename words shared by several themes.")
+    parser.add_argument("--input", type=Path, default=INPUT, help="Bank to clean (JSON list or JSONL)")
+    parser.add_argument("--output", type=Path, default=OUTPUT, help="Where to write the cleaned bank")
+    parser.add_argument("--max-length", type=int,
+                        help="Longest replacement in letters (default: max_word_length capped by grid_size)")
+    args = parser.parse_args()
+
+    data = list(iter_bank(args.input))
 
     # 1) Build automatic replacements for ALL duplicates (e.g. ALPINE x3)
-    auto_repl = build_auto_replacements(data)
+    plan = build_auto_replacements(data, MANUAL_REPLACEMENTS, args.max_length)
 
     # 2) Merge with your hand-made REPLACEMENTS (powdersnow, powstash, etc.)
-    all_repl = merge_replacements(auto_repl, MANUAL_REPLACEMENTS)
+    all_repl = merge_replacements(plan.replacements, MANUAL_REPLACEMENTS)
 
     # 3) Apply everything
     cleaned = transform(data, all_repl)
@@ -111,8 +239,14 @@ def main():
     # Optional: inspect a few specific words like 'alpine'
     # print(json.dumps(all_repl.get("ALPINE", {}), indent=2))
 
-    OUTPUT.write_text(json.dumps(cleaned, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"Wrote cleaned JSON to {OUTPUT}")
+    args.output.write_text(json.dumps(cleaned, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Wrote cleaned JSON to {args.output}")
+    rate = plan.duplicates / plan.seconds if plan.seconds else 0.0
+    print(f"[apply_replacements] {plan.duplicates} duplicates in {plan.groups} groups "
+          f"({plan.manual} manual) resolved in {plan.seconds:.3f}s ({rate:,.0f}/s), "
+          f"{plan.repeats} repeats inside a theme dropped")
+    for word, theme in plan.unresolved:
+        print(f"  ⚠ No room for a replacement of '{word}' in {theme} - add one to REPLACEMENTS")
 
 
 if __name__ == "__main__":
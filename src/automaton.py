@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import string
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+ALPHABET = string.ascii_uppercase
+
+
+class WordAutomaton:
+    """Aho-Corasick automaton compiled to a dense DFA over A-Z.
+
+    Every state has a transition for every letter, so scanning a line (or
+    extending a partial line by one cell) is a single table lookup per letter.
+    Characters outside the alphabet reset the automaton to the root.
+    """
+
+    def __init__(self, words: Iterable[str], alphabet: str = ALPHABET) -> None:
+        self.alphabet = alphabet
+        self.width = len(alphabet)
+        self._index = {ch: i for i, ch in enumerate(alphabet)}
+
+        self.words: List[str] = []
+        seen: Dict[str, int] = {}
+        for word in words:
+            key = word.upper().replace(" ", "")
+            if key and key not in seen and all(ch in self._index for ch in key):
+                seen[key] = len(self.words)
+                self.words.append(key)
+
+        self._build()
+
+    def _build(self) -> None:
+        width = self.width
+        trie: List[Dict[int, int]] = [{}]
+        terminal: List[int] = [-1]
+        depth: List[int] = [0]
+
+        for word_id, word in enumerate(self.words):
+            state = 0
+            for ch in word:
+                sym = self._index[ch]
+                nxt = trie[state].get(sym)
+                if nxt is None:
+                    nxt = len(trie)
+                    trie[state][sym] = nxt
+                    trie.append({})
+                    terminal.append(-1)
+                    depth.append(depth[state] + 1)
+                state = nxt
+            terminal[state] = word_id
+
+        num_states = len(trie)
+        goto = array("i", [0]) * (num_states * width)
+        fail = array("i", [0]) * num_states
+        # Nearest state on the failure chain (itself included) that ends a word.
+        out = array("i", [-1]) * num_states
+        # Length of the longest word ending in each state, 0 when none does.
+        match_len = array("i", [0]) * num_states
+
+        queue: deque[int] = deque()
+        for sym in range(width):
+            nxt = trie[0].get(sym)
+            if nxt is not None:
+                goto[sym] = nxt
+                queue.append(nxt)
+
+        while queue:
+            state = queue.popleft()
+            out[state] = state if terminal[state] != -1 else out[fail[state]]
+            match_len[state] = depth[out[state]] if out[state] != -1 else 0
+            base = state * width
+            fail_base = fail[state] * width
+            for sym in range(width):
+                nxt = trie[state].get(sym)
+                if nxt is None:
+                    goto[base + sym] = goto[fail_base + sym]
+                else:
+                    goto[base + sym] = nxt
+                    fail[nxt] = goto[fail_base + sym]
+                    queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._terminal = terminal
+        self._depth = depth
+        self.match_len = match_len
+        self.num_states = num_states
+
+    def step(self, state: int, letter: str) -> int:
+        """Advance ``state`` by one letter."""
+        sym = self._index.get(letter)
+        if sym is None:
+            return 0
+        return self._goto[state * self.width + sym]
+
+    def matches_at(self, state: int) -> Iterator[int]:
+        """Yield ids of every word that ends in ``state``, longest first."""
+        node = self._out[state]
+        while node > 0:
+            yield self._terminal[node]
+            node = self._out[self._fail[node]]
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield ``(end_index, word_id)`` for every occurrence in ``text``."""
+        state = 0
+        for idx, letter in enumerate(text.upper()):
+            state = self.step(state, letter)
+            if self.match_len[state]:
+                for word_id in self.matches_at(state):
+                    yield idx, word_id
+
+    def contains_any(self, text: str) -> bool:
+        state = 0
+        for letter in text.upper():
+            state = self.step(state, letter)
+            if self.match_len[state]:
+                return True
+        return False
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List
+
+from . import generate_book
+from .generate_book import CONFIG
+
+
+BOOK_DEFAULTS: Dict[str, Any] = {
+    "count": CONFIG.get('puzzle_generation', 'count'),
+    "size": CONFIG.get('puzzle_generation', 'grid_size'),
+    "seed": CONFIG.get('puzzle_generation', 'seed'),
+    "fill_mode": None,
+    "difficulty": None,
+    "compression": None,
+    "optimize": None,
+    "biski_path": None,
+    "config": {},
+}
+
+
+def merge_config(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of ``base`` with ``overrides`` merged in section by section."""
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def load_manifest(path: Path) -> List[Dict[str, Any]]:
+    """Read a manifest: either a list of books or ``{"defaults": {...}, "books": [...]}``."""
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(raw, list):
+        defaults, books = {}, raw
+    else:
+        defaults, books = raw.get("defaults", {}), raw.get("books", [])
+
+    specs = []
+    for idx, book in enumerate(books):
+        spec = merge_config(BOOK_DEFAULTS, defaults)
+        spec = merge_config(spec, book)
+        if not spec.get("output"):
+            raise ValueError(f"Book #{idx + 1} in {path} has no 'output'")
+        specs.append(spec)
+    return specs
+
+
+def generation_key(spec: Dict[str, Any], base_config: Dict[str, Any]) -> str:
+    """Hash of everything that decides which puzzles a book gets.
+
+    Books with the same key get identical puzzles, so they share one
+    generation run regardless of trim, palette or fonts.
+    """
+    generation = merge_config(base_config, spec["config"]).get("puzzle_generation", {})
+    payload = {
+        "count": spec["count"],
+        "size": spec["size"],
+        "seed": spec["seed"],
+        "fill_mode": spec["fill_mode"],
+        "difficulty": spec["difficulty"],
+        "puzzle_generation": generation,
+    }
+    blob = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+def warm_caches() -> None:
+    """Load fonts and decode page art once, before workers fork."""
+    generate_book.ensure_fonts()
+    for asset in (generate_book.ASSET_LEFT, generate_book.ASSET_RIGHT):
+        reader = generate_book.load_image_reader(asset)
+        if reader is not None:
+            reader.getRGBData()
+
+
+def run_group(key: str, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Build every book of one generation group, generating the puzzles once."""
+    base_config = copy.deepcopy(CONFIG.data)
+    puzzles = None
+    outcomes: Counter = Counter()  # generation outcomes, shared by the whole group
+    results = []
+    try:
+        for spec in specs:
+            entry: Dict[str, Any] = {"output": spec["output"], "group": key, "worker": os.getpid()}
+            started = time.perf_counter()
+            try:
+                CONFIG.data = merge_config(base_config, spec["config"])
+                generate_book.reload_layout()
+                entry["reused_puzzles"] = puzzles is not None
+                if puzzles is None:
+                    puzzles = generate_book.build_puzzles(
+                        spec["count"], spec["size"], spec["seed"], spec["fill_mode"], spec["difficulty"],
+                        outcomes,
+                    )
+                output = Path(spec["output"])
+                output.parent.mkdir(parents=True, exist_ok=True)
+                report = generate_book.generate_pdf(
+                    output,
+                    spec["count"],
+                    spec["size"],
+                    spec["seed"],
+                    Path(spec["biski_path"]) if spec["biski_path"] else None,
+                    puzzles=puzzles,
+                    compression=spec["compression"],
+                    optimize=spec["optimize"],
+                )
+                entry.update(
+                    status="ok",
+                    puzzles=report.puzzles,
+                    pages=report.pages,
+                    bytes=report.bytes,
+                    bytes_before=report.bytes_before,
+                    compression=report.compression,
+                    outcomes=dict(outcomes),  # see reused_puzzles: counted once per group
+                )
+            except Exception as exc:  # keep going with the rest of the release
+                entry.update(status="error", error=f"{type(exc).__name__}: {exc}")
+            entry["seconds"] = round(time.perf_counter() - started, 3)
+            results.append(entry)
+    finally:
+        CONFIG.data = base_config
+        generate_book.reload_layout()
+    return results
+
+
+def run_batch(specs: List[Dict[str, Any]], workers: int = 1) -> Dict[str, Any]:
+    """Group books by generation key and build the groups across ``workers`` processes."""
+    started = time.perf_counter()
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for spec in specs:
+        groups.setdefault(generation_key(spec, CONFIG.data), []).append(spec)
+
+    # Biggest groups first so one long group doesn't start last.
+    ordered = sorted(groups.items(), key=lambda item: -sum(s["count"] for s in item[1]))
+    print(f"[batch] {len(specs)} books in {len(groups)} generation groups, {workers} worker(s)")
+
+    warm_caches()
+    results: List[Dict[str, Any]] = []
+    if workers <= 1 or len(ordered) == 1:
+        for key, group in ordered:
+            results.extend(run_group(key, group))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(ordered))) as pool:
+            futures = [pool.submit(run_group, key, group) for key, group in ordered]
+            for future in as_completed(futures):
+                results.extend(future.result())
+
+    order = {spec["output"]: idx for idx, spec in enumerate(specs)}
+    results.sort(key=lambda entry: order[entry["output"]])
+    ok = [r for r in results if r["status"] == "ok"]
+    return {
+        "books": results,
+        "groups": len(groups),
+        "workers": workers,
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "total_pages": sum(r["pages"] for r in ok),
+        "total_bytes": sum(r["bytes"] for r in ok),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(f"\n{'Output':<40} {'Group':<12} {'Pages':>5} {'KB':>8} {'Sec':>7}  Status")
+    for entry in summary["books"]:
+        if entry["status"] == "ok":
+            reused = " (cached puzzles)" if entry["reused_puzzles"] else ""
+            print(f"{entry['output']:<40} {entry['group']:<12} {entry['pages']:>5} "
+                  f"{entry['bytes'] / 1024:>8.1f} {entry['seconds']:>7.2f}  ok{reused}")
+        else:
+            print(f"{entry['output']:<40} {entry['group']:<12} {'-':>5} {'-':>8} "
+                  f"{entry['seconds']:>7.2f}  {entry['error']}")
+    print(f"\n{summary['succeeded']} built, {summary['failed']} failed, "
+          f"{summary['total_pages']} pages, {summary['total_bytes'] / 1024:.1f} KB "
+          f"in {summary['seconds']:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build many book editions from one manifest.")
+    parser.add_argument("manifest", type=Path, help="JSON manifest of book specs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--report", type=Path, help="Optional path for the JSON summary report")
+    args = parser.parse_args()
+
+    summary = run_batch(load_manifest(args.manifest), args.workers)
+    print_summary(summary)
+    if args.report:
+        args.report.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config.config_loader import Config
+from .apply_replacements import build_auto_replacements, merge_replacements, transform
+from .dedup import iter_bank
+from .rename_themes import rename_themes
+from .replacements import REPLACEMENTS as MANUAL_REPLACEMENTS
+
+
+# Compiled banks are rejected when this differs; bump it whenever the
+# per-theme fields below change meaning.
+BANK_FORMAT = "word-search-bank"
+BANK_FORMAT_VERSION = 1
+
+# Grid sizes the fits table covers.
+GRID_SIZES = range(6, 31)
+
+
+def normalize_word(word: str) -> str:
+    """How a word is placed in the grid: upper-case, no spaces."""
+    return word.upper().replace(" ", "")
+
+
+def is_compiled(data: Any) -> bool:
+    return isinstance(data, dict) and data.get("format") == BANK_FORMAT
+
+
+def compiled_themes(data: Dict[str, Any], source: str = "bank") -> List[Dict[str, Any]]:
+    """Themes of a compiled bank, after checking its format version."""
+    version = data.get("version")
+    if version != BANK_FORMAT_VERSION:
+        raise ValueError(
+            f"{source} was compiled with bank format {version}, expected {BANK_FORMAT_VERSION}; "
+            "rerun `python -m src.compile_bank`"
+        )
+    return data["themes"]
+
+
+def validate(entries: Iterable[dict], max_length: int, issues: Counter) -> Iterable[dict]:
+    """Yield well-formed entries keeping only placeable words; count what was dropped.
+
+    Any letter ``str.isalpha()`` accepts is placeable: grids are stored as
+    text and spooled as UTF-8, so non-ASCII letters survive the build.
+    """
+    for entry in entries:
+        theme, words = entry.get("theme"), entry.get("words")
+        if not isinstance(theme, str) or not isinstance(words, list):
+            issues["malformed entry"] += 1
+            continue
+        kept = []
+        for word in words:
+            if not isinstance(word, str) or not word.strip():
+                issues["empty word"] += 1
+            elif not normalize_word(word.strip()).isalpha():
+                issues["non-letter word"] += 1
+            elif len(normalize_word(word.strip())) > max_length:
+                issues["too long"] += 1
+            else:
+                kept.append(word.strip())
+        yield {"theme": theme, "words": kept}
+
+
+def compile_theme(entry: dict, grid_sizes: Iterable[int]) -> Dict[str, Any]:
+    """Everything a build needs about one theme, computed once."""
+    normalized = [normalize_word(word) for word in entry["words"]]
+    lengths = [len(word) for word in normalized]
+    letters = Counter("".join(normalized))
+    return {
+        "theme": entry["theme"],
+        "words": entry["words"],
+        "normalized": normalized,
+        "lengths": lengths,
+        "letters": dict(sorted(letters.items())),
+        # Words that fit each grid size, so builds can skip short themes up front.
+        "fits": {str(size): sum(1 for length in lengths if length <= size) for size in grid_sizes},
+    }
+
+
+def compile_bank(
+    source: Path,
+    max_length: int | None = None,
+    grid_sizes: Iterable[int] = GRID_SIZES,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Validate, rename themes, dedupe, apply replacements and normalize a raw bank.
+
+    Returns ``(artifact, report)``; the artifact is what ``puzzle_bank`` loads.
+    """
+    started = time.perf_counter()
+    max_length = max_length or Config("config/config.json").get('puzzle_generation', 'max_word_length') or 25
+    grid_sizes = list(grid_sizes)
+    issues: Counter = Counter()
+
+    entries = list(rename_themes(validate(iter_bank(source), max_length, issues)))
+    plan = build_auto_replacements(entries, MANUAL_REPLACEMENTS, max_length)
+    entries = transform(entries, merge_replacements(plan.replacements, MANUAL_REPLACEMENTS))
+    if plan.repeats:
+        issues["repeated in theme"] += plan.repeats
+    for word, theme in plan.unresolved:
+        issues["unresolved duplicate"] += 1
+        print(f"  ⚠ '{word}' is still shared by {theme}: no room for a replacement")
+
+    themes = [compile_theme(entry, grid_sizes) for entry in entries]
+    artifact = {
+        "format": BANK_FORMAT,
+        "version": BANK_FORMAT_VERSION,
+        "source": Path(source).name,
+        "source_sha1": hashlib.sha1(Path(source).read_bytes()).hexdigest(),
+        "max_length": max_length,
+        "grid_sizes": [grid_sizes[0], grid_sizes[-1]] if grid_sizes else [],
+        "themes": themes,
+    }
+    report = {
+        "themes": len(themes),
+        "words": sum(len(theme["words"]) for theme in themes),
+        "replaced": plan.duplicates,
+        "issues": dict(issues),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    return artifact, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compile a raw puzzle bank into a validated, deduplicated, ready-to-generate artifact."
+    )
+    parser.add_argument("source", type=Path, help="Raw bank: JSON list or JSONL of {theme, words} entries")
+    parser.add_argument("--output", type=Path, default=Path("puzzle_bank.compiled.json"), help="Artifact path")
+    parser.add_argument("--max-length", type=int,
+                        help="Longest word kept (default: puzzle_generation.max_word_length)")
+    args = parser.parse_args()
+
+    artifact, report = compile_bank(args.source, args.max_length)
+    args.output.write_text(json.dumps(artifact, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    issues = ", ".join(f"{count} {name}" for name, count in report["issues"].items()) or "none"
+    print(f"[compile_bank] {report['themes']} themes, {report['words']} words, "
+          f"{report['replaced']} duplicates replaced in {report['seconds']:.2f}s -> {args.output}")
+    print(f"[compile_bank] Dropped/flagged: {issues}")
+    print(f"[compile_bank] Point general.puzzle_data at {args.output.name} to build from it")
+
+
+if __name__ == "__main__":
+    main()
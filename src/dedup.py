@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .automaton import WordAutomaton
+
+
+# Finding kinds, from most to least certain.
+EXACT = "exact"        # same word after trimming and upper-casing
+NEAR = "near"          # same letters after dropping spaces/punctuation, or a plural/suffix variant
+CONTAINS = "contains"  # a word is spelled inside another word of the same puzzle
+
+FINDING_KINDS = (EXACT, NEAR, CONTAINS)
+
+# Suffixes folded together for near-duplicate detection, longest first.
+# Each is only stripped when at least MIN_STEM letters remain.
+SUFFIXES: Tuple[Tuple[str, str], ...] = (
+    ("IES", "Y"),
+    ("SSES", "SS"),
+    ("XES", "X"),
+    ("CHES", "CH"),
+    ("SHES", "SH"),
+    ("ING", ""),
+    ("ED", ""),
+    ("S", ""),
+)
+MIN_STEM = 3
+
+
+def exact_key(word: str) -> str:
+    """Upper-case and strip surrounding spaces so duplicates are caught reliably."""
+    return word.strip().upper()
+
+
+def letters_key(word: str) -> str:
+    """Letters only: ``"Ice-Axe"``, ``"ice axe"`` and ``"ICEAXE"`` share a key."""
+    return "".join(ch for ch in word.upper() if ch.isalpha())
+
+
+def stem_key(word: str) -> str:
+    """``letters_key`` with one plural or verb suffix folded away."""
+    key = letters_key(word)
+    if key.endswith("SS"):
+        return key
+    for suffix, replacement in SUFFIXES:
+        if key.endswith(suffix) and len(key) - len(suffix) + len(replacement) >= MIN_STEM:
+            return key[: -len(suffix)] + replacement
+    return key
+
+
+@dataclass(frozen=True)
+class Finding:
+    """``word`` in ``theme`` clashes with ``other_word`` in ``other_theme``.
+
+    For ``contains`` both words are in the same theme and ``word`` is the
+    shorter one, spelled (forwards or backwards) inside ``other_word``.
+    """
+    kind: str
+    theme: str
+    word: str
+    other_theme: str
+    other_word: str
+
+
+class DedupEngine:
+    """Streaming duplicate detector over ``{"theme", "words"}`` bank entries.
+
+    Entries are fed one at a time and only per-key owners are kept, so a bank
+    never has to be loaded as a whole. Exact and near duplicates are checked
+    against every earlier word in O(1) per word; containment is checked per
+    theme with an Aho-Corasick automaton over that theme's words, which scans
+    each word once instead of comparing every pair.
+    """
+
+    def __init__(self, near: bool = True, containment: bool = True) -> None:
+        self.near = near
+        self.containment = containment
+        # First (theme, word) seen per key: later occurrences are the duplicates.
+        self._owners: Dict[str, Tuple[str, str]] = {}
+        self._stems: Dict[str, Tuple[str, str]] = {}
+        self.counts: Counter[str] = Counter()
+        self.theme_count = 0
+        self.total_words = 0
+
+    def add(self, theme: str, word: str) -> Finding | None:
+        """Register one word; return its clash with an earlier word, if any.
+
+        Only words that are not exact duplicates become owners, so the first
+        spelling of a word is the one later findings point at.
+        """
+        key = exact_key(word)
+        self.counts[key] += 1
+        owner = self._owners.get(key)
+        if owner is not None:
+            return Finding(EXACT, theme, word, *owner)
+        self._owners[key] = (theme, word)
+
+        if self.near:
+            stem = stem_key(word)
+            owner = self._stems.get(stem)
+            if owner is not None:
+                return Finding(NEAR, theme, word, *owner)
+            if stem:
+                self._stems[stem] = (theme, word)
+        return None
+
+    def scan(self, theme: str, words: Sequence[str]) -> List[Finding]:
+        """Register one theme's words and return what clashes with earlier words."""
+        self.theme_count += 1
+        self.total_words += len(words)
+        findings = [finding for finding in (self.add(theme, word) for word in words) if finding]
+        if self.containment:
+            findings.extend(contained_words(theme, words))
+        return findings
+
+    def feed(self, entries: Iterable[dict]) -> Iterator[Tuple[dict, List[Finding]]]:
+        """Yield each entry with its findings, as the entries arrive."""
+        for entry in entries:
+            yield entry, self.scan(entry["theme"], entry["words"])
+
+    def is_duplicate(self, word: str) -> bool:
+        """True when an exactly matching word has been seen already."""
+        return exact_key(word) in self._owners
+
+    @property
+    def unique_words(self) -> int:
+        return len(self.counts)
+
+    def duplicates(self) -> List[Tuple[str, int]]:
+        """``(key, count)`` for every key seen more than once, most frequent first."""
+        return sorted(
+            [(word, count) for word, count in self.counts.items() if count > 1],
+            key=lambda item: (-item[1], item[0]),
+        )
+
+
+def contained_words(theme: str, words: Sequence[str]) -> List[Finding]:
+    """Words of one puzzle that can also be read inside a longer word of it.
+
+    Such a word has two valid answers in the grid, forwards or backwards.
+    """
+    keys: Dict[str, str] = {}
+    for word in words:
+        keys.setdefault(letters_key(word), word)
+    automaton = WordAutomaton(keys)
+    if not automaton.words:
+        return []
+
+    findings: List[Finding] = []
+    for key, word in keys.items():
+        found = set()
+        for text in (key, key[::-1]):
+            for _, word_id in automaton.find_all(text):
+                inner = automaton.words[word_id]
+                if inner != key and inner not in found:
+                    found.add(inner)
+                    findings.append(Finding(CONTAINS, theme, keys[inner], theme, word))
+    return findings
+
+
+def iter_bank(path: Path, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the entries of a bank file one at a time.
+
+    ``.jsonl`` files hold one entry per line; ``.json`` files hold a list of
+    entries, which is decoded element by element from fixed-size chunks.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as handle:
+        if path.suffix.lower() == ".jsonl":
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        buffer = handle.read(chunk_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} is not a JSON list of bank entries")
+        buffer = buffer[1:]
+        eof = False
+        while True:
+            buffer = buffer.lstrip().lstrip(",").lstrip()
+            if buffer.startswith("]"):
+                return
+            try:
+                entry, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = handle.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            yield entry
+            buffer = buffer[end:]
+
+
+def dedupe_entries(entries: Iterable[dict]) -> Iterator[dict]:
+    """Yield entries with every exact duplicate of an earlier word dropped."""
+    engine = DedupEngine(near=False, containment=False)
+    for entry in entries:
+        theme = entry["theme"]
+        unique_words = [word for word in entry["words"] if engine.add(theme, word) is None]
+        yield {"theme": theme, "words": unique_words}
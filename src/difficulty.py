@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .automaton import WordAutomaton
+from .word_search import (
+    DIRECTIONS,
+    FORWARD_DIRECTIONS,
+    HARD_DIRECTIONS,
+    STRAIGHT_DIRECTIONS,
+    FillFailed,
+    PuzzleResult,
+    WordSearchPuzzle,
+    scan_lines,
+)
+
+
+# Weight of each normalized component in the 0-100 score.
+WEIGHTS: Dict[str, float] = {
+    "diagonal": 20.0,   # share of diagonal words
+    "backwards": 25.0,  # share of words read right-to-left / bottom-to-top
+    "overlap": 10.0,    # share of word letters shared with another word
+    "decoys": 20.0,     # near-matches (word prefixes) running through filler
+    "short": 10.0,      # share of short words (fewer distinctive letters)
+    "filler": 15.0,     # share of the grid that is filler
+}
+
+
+# Score bands (lower bound inclusive, upper bound exclusive).
+BANDS: Dict[str, Tuple[float, float]] = {
+    "easy": (0.0, 30.0),
+    "medium": (30.0, 45.0),
+    "hard": (45.0, 101.0),
+}
+
+
+SHORT_WORD_LENGTH = 5
+MIN_DECOY_LENGTH = 3
+
+
+# Generation strategies tried by ``generate_for_difficulty``, easiest first.
+STRATEGIES: Dict[str, dict] = {
+    "straight": {"directions": STRAIGHT_DIRECTIONS, "fill_mode": "constrained"},
+    "forward": {"directions": FORWARD_DIRECTIONS, "fill_mode": "constrained"},
+    "mixed": {"directions": DIRECTIONS, "fill_mode": "constrained"},
+    "mixed_random_fill": {"directions": DIRECTIONS, "fill_mode": "random"},
+    "twisted": {"directions": HARD_DIRECTIONS, "fill_mode": "random"},
+}
+
+
+# Strategies worth trying first for each band.
+BAND_STRATEGIES: Dict[str, Tuple[str, ...]] = {
+    "easy": ("straight", "forward", "mixed"),
+    "medium": ("forward", "mixed", "mixed_random_fill", "straight"),
+    "hard": ("twisted", "mixed_random_fill", "mixed"),
+}
+
+
+@dataclass
+class DifficultyScore:
+    score: float
+    band: str
+    components: Dict[str, float] = field(default_factory=dict)
+    decoys: int = 0
+
+
+@dataclass
+class TargetedPuzzle:
+    puzzle: Optional[WordSearchPuzzle]
+    difficulty: Optional[DifficultyScore]
+    strategy: str
+    seed: Optional[int]
+    attempts: int
+    hit: bool
+    fill_failures: int = 0  # attempts lost to FillFailed (banned words too strict)
+
+
+def band_for(score: float) -> str:
+    for name, (low, high) in BANDS.items():
+        if low <= score < high:
+            return name
+    return "hard"
+
+
+def count_decoys(puzzle: WordSearchPuzzle | PuzzleResult, min_length: int = MIN_DECOY_LENGTH) -> int:
+    """Count word prefixes that appear on a line through at least one filler cell.
+
+    A decoy is a partial word (e.g. ``SNOWF`` for ``SNOWFLAKE``) that a solver
+    will chase and abandon. Prefixes are matched in both reading directions.
+    """
+    prefixes = [
+        word[:length]
+        for word in (placed.word for placed in puzzle.placements)
+        for length in range(min_length, len(word))
+    ]
+    if not prefixes:
+        return 0
+    automaton = WordAutomaton(prefixes + [p[::-1] for p in prefixes])
+    solution = puzzle.solution_coords()
+    grid = puzzle.as_rows()
+
+    decoys = 0
+    for line in scan_lines(puzzle.size):
+        text = "".join(grid[y][x] for x, y in line)
+        for end, word_id in automaton.find_all(text):
+            length = len(automaton.words[word_id])
+            if any(cell not in solution for cell in line[end - length + 1:end + 1]):
+                decoys += 1
+    return decoys
+
+
+def score_puzzle(puzzle: WordSearchPuzzle | PuzzleResult) -> DifficultyScore:
+    """Score a generated puzzle from 0 (easiest) to 100 (hardest)."""
+    placements = puzzle.placements
+    total = max(len(placements), 1)
+
+    cell_uses: Dict[Tuple[int, int], int] = {}
+    for placed in placements:
+        for cell in placed.path:
+            cell_uses[cell] = cell_uses.get(cell, 0) + 1
+    letters = sum(len(p.path) for p in placements) or 1
+    shared = sum(uses for uses in cell_uses.values() if uses > 1)
+
+    decoys = count_decoys(puzzle)
+
+    components = {
+        "diagonal": sum(1 for p in placements if p.direction_family == "D") / total,
+        "backwards": sum(1 for p in placements if p.backwards) / total,
+        "overlap": shared / letters,
+        "decoys": min(1.0, 2.0 * decoys / total),
+        "short": sum(1 for p in placements if len(p.word) <= SHORT_WORD_LENGTH) / total,
+        "filler": 1.0 - len(cell_uses) / float(puzzle.size * puzzle.size),
+    }
+    score = round(sum(WEIGHTS[name] * value for name, value in components.items()), 1)
+    return DifficultyScore(score=score, band=band_for(score), components=components, decoys=decoys)
+
+
+def generate_for_difficulty(
+    words: Sequence[str],
+    size: int,
+    target: str | Tuple[float, float],
+    seed: int = 0,
+    max_attempts: int = 24,
+    time_budget: Optional[float] = None,
+    strategies: Optional[Sequence[str]] = None,
+    **puzzle_kwargs,
+) -> TargetedPuzzle:
+    """Search strategies and seeds until the puzzle score lands in ``target``.
+
+    ``target`` is a band name from BANDS or an explicit ``(low, high)`` range.
+    The search stops after ``max_attempts`` generations or ``time_budget``
+    seconds; when the band is never hit the closest puzzle found is returned
+    with ``hit=False``.
+    """
+    if isinstance(target, str):
+        low, high = BANDS[target]
+        order = strategies or BAND_STRATEGIES[target]
+    else:
+        low, high = target
+        order = strategies or tuple(STRATEGIES)
+    midpoint = (low + high) / 2
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+
+    best: Optional[TargetedPuzzle] = None
+    best_distance = float("inf")
+    attempts = 0
+    fill_failures = 0
+    for attempt in range(max_attempts):
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        # Cycle through the strategies, moving to the next seed after each round.
+        name = order[attempt % len(order)]
+        attempt_seed = seed + attempt // len(order)
+        attempts += 1
+        puzzle = WordSearchPuzzle(
+            size=size,
+            words=list(words),
+            seed=attempt_seed,
+            **{**STRATEGIES[name], **puzzle_kwargs},
+        )
+        try:
+            puzzle.generate()
+        except FillFailed:
+            fill_failures += 1
+            continue
+        except RuntimeError:
+            continue
+
+        difficulty = score_puzzle(puzzle)
+        if low <= difficulty.score < high:
+            return TargetedPuzzle(puzzle, difficulty, name, attempt_seed, attempts, True, fill_failures)
+
+        distance = abs(difficulty.score - midpoint)
+        if distance < best_distance:
+            best_distance = distance
+            best = TargetedPuzzle(puzzle, difficulty, name, attempt_seed, attempts, False)
+
+    if best is None:
+        return TargetedPuzzle(None, None, "", None, attempts, False, fill_failures)
+    best.attempts = attempts
+    best.fill_failures = fill_failures
+    return best
+
+
+def summarize(scores: List[DifficultyScore]) -> Dict[str, int]:
+    """Count puzzles per band, e.g. for a build report."""
+    counts = {name: 0 for name in BANDS}
+    for entry in scores:
+        counts[entry.band] += 1
+    return counts
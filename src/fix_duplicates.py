@@ -1,11 +1,13 @@
+from __future__ import annotations
+
+import argparse
 import json
+from pathlib import Path
+from typing import Iterable, Iterator
 
-# Load your file
-with open('src/8-10.json', 'r', encoding='utf-8') as f:
-    puzzles = json.load(f)
+from .dedup import DedupEngine, iter_bank
 
-# Track ALL words globally to avoid any duplicates
-global_words = set()
+WORDS_PER_THEME = 40
 
 # Theme-specific replacements for your 40 themes
 theme_replacements = {
@@ -61,52 +63,56 @@ theme_replacements = {
     "Opposites & Antonyms": ["opposite", "contrary", "converse", "reverse", "inverse", "between", "middle", "center", "forward", "backward"]
 }
 
-final_puzzles = []
-
-for puzzle in puzzles:
-    theme = puzzle['theme']
-    words = puzzle['words']
-    
-    # Remove words with numbers AND duplicates
-    cleaned_words = []
-    for w in words:
-        w_upper = w.upper()
-        # Skip if contains any digit OR already used
-        if any(char.isdigit() for char in w):
-            continue
-        if w_upper not in global_words:
-            cleaned_words.append(w)
-            global_words.add(w_upper)
-    
-    # Add unique replacements if needed (also check for numbers!)
-    if len(cleaned_words) < 40:
-        needed = 40 - len(cleaned_words)
-        replacements = theme_replacements.get(theme, [])
-        
-        for repl in replacements:
-            if needed == 0:
+
+def has_digit(word: str) -> bool:
+    return any(char.isdigit() for char in word)
+
+
+def fix_bank(entries: Iterable[dict], engine: DedupEngine, words_per_theme: int = WORDS_PER_THEME) -> Iterator[dict]:
+    """Drop words with digits and words used by an earlier theme, then top up
+    each theme from ``theme_replacements`` to ``words_per_theme`` words."""
+    for puzzle in entries:
+        theme = puzzle['theme']
+
+        # Remove words with numbers AND duplicates
+        cleaned_words = [w for w in puzzle['words'] if not has_digit(w) and engine.add(theme, w) is None]
+
+        # Add unique replacements if needed (also check for numbers!)
+        needed = words_per_theme - len(cleaned_words)
+        for repl in theme_replacements.get(theme, []):
+            if needed <= 0:
                 break
-            # Skip if contains numbers
-            if any(char.isdigit() for char in repl):
-                continue
-            if repl.upper() not in global_words:
+            if not has_digit(repl) and engine.add(theme, repl) is None:
                 cleaned_words.append(repl)
-                global_words.add(repl.upper())
                 needed -= 1
-    
-    final_puzzles.append({
-        "theme": theme,
-        "words": cleaned_words[:40]
-    })
-
-# Save final version
-with open('8-10_clean.json', 'w', encoding='utf-8') as f:
-    json.dump(final_puzzles, f, indent=2, ensure_ascii=False)
-
-print(f"✅ Fixed! All duplicates removed, NO NUMBERS!")
-print(f"Total themes: {len(final_puzzles)}")
-print(f"Total unique words: {len(global_words)}")
-print(f"\nThemes with replacements needed:")
-for puzzle in final_puzzles:
-    if len(puzzle['words']) < 40:
-        print(f"  - {puzzle['theme']}: {len(puzzle['words'])} words")
+
+        yield {
+            "theme": theme,
+            "words": cleaned_words[:words_per_theme]
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove duplicate and numbered words, topping themes up to 40 words.")
+    parser.add_argument("--input", type=Path, default=Path("src/8-10.json"), help="Bank to fix (JSON list or JSONL)")
+    parser.add_argument("--output", type=Path, default=Path("8-10_clean.json"), help="Where to write the fixed bank")
+    args = parser.parse_args()
+
+    engine = DedupEngine(near=False, containment=False)
+    final_puzzles = list(fix_bank(iter_bank(args.input), engine))
+
+    # Save final version
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(final_puzzles, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ Fixed! All duplicates removed, NO NUMBERS!")
+    print(f"Total themes: {len(final_puzzles)}")
+    print(f"Total unique words: {engine.unique_words}")
+    print(f"\nThemes with replacements needed:")
+    for puzzle in final_puzzles:
+        if len(puzzle['words']) < WORDS_PER_THEME:
+            print(f"  - {puzzle['theme']}: {len(puzzle['words'])} words")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Tuple
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+
+# Content digest per file, keyed by (resolved path, mtime, size) so an
+# unchanged file is hashed once per process.
+_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+# ReportLab font name per content digest: each TTF is parsed once per process.
+_REGISTERED: Dict[str, str] = {}
+
+
+def font_digest(path: Path) -> str:
+    """Short content hash of a font file."""
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    digest = _DIGESTS.get(key)
+    if digest is None:
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()[:16]
+        _DIGESTS[key] = digest
+    return digest
+
+
+def font_name_for(digest: str) -> str:
+    return f"TTF-{digest}"
+
+
+def register_ttf(path: Path) -> str:
+    """Register ``path`` with ReportLab and return its font name.
+
+    The name is derived from the file content, so the same font uploaded
+    under another file name (or registered again by a later build) reuses
+    the already parsed face and its metrics.
+    """
+    digest = font_digest(path)
+    name = _REGISTERED.get(digest)
+    if name is None:
+        name = font_name_for(digest)
+        if name not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(name, str(path)))
+            print(f"[fonts] Registered {Path(path).name} as {name}")
+        _REGISTERED[digest] = name
+    return name
+
+
+def store_font_bytes(data: bytes, directory: Path, suffix: str = ".ttf") -> Path:
+    """Save uploaded font bytes under a content-hash file name.
+
+    The file is written only if no font with the same content is stored yet.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"{hashlib.sha1(data).hexdigest()[:16]}{suffix.lower()}"
+    if not target.exists():
+        target.write_bytes(data)
+    return target
@@ -1,22 +1,55 @@
 from __future__ import annotations
 
 import argparse
+import json
 import math
+import struct
 import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Iterable, List, Sequence, Tuple
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Sequence, Tuple
 
-from PIL import Image
-from reportlab.lib import colors
+import reportlab
+from reportlab.lib.rl_accel import fp_str
 from reportlab.lib.units import inch
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
-
-from .word_search import WordSearchPuzzle, PlacedWord
-from .puzzle_bank import PUZZLES
+from reportlab.pdfgen.canvas import FILL_NON_ZERO
+
+from .fonts import register_ttf
+from .page_model import (
+    Capsule,
+    Grid,
+    GridGeometry,
+    ImageRef,
+    Op,
+    Page,
+    Rect,
+    RoundRect,
+    TextRun,
+    color,
+    make_geometry,
+)
+from .pdf_optimize import optimize_pdf
+from .difficulty import BANDS, generate_for_difficulty, summarize
+from .word_search import (
+    FILL_MODES,
+    LETTER_PROFILES,
+    Budget,
+    BudgetExceeded,
+    FillFailed,
+    PlacedWord,
+    PuzzleResult,
+    WordSearchPuzzle,
+)
+from .puzzle_bank import PUZZLE_FILE, PUZZLES, usable_words as bank_usable_words
+from .seed_search import load_seed_table
 
 # Import config
 sys.path.append(str(Path(__file__).parent.parent))
@@ -29,6 +62,7 @@ CONFIG = Config("config/config.json")
 PAGE_WIDTH = CONFIG.get('page', 'width') * inch
 PAGE_HEIGHT = CONFIG.get('page', 'height') * inch
 MARGIN = CONFIG.get('page', 'margin') * inch
+# ReportLab names of the registered fonts; set by ensure_fonts()
 FONT_DISPLAY = "Biski"
 FONT_TEXT = "Biski"
 
@@ -36,36 +70,57 @@ FONT_TEXT = "Biski"
 ASSET_LEFT = Path(CONFIG.get('images', 'left_image'))
 ASSET_RIGHT = Path(CONFIG.get('images', 'right_image'))
 USER_BISKI_PATH: Path | None = None
+# Solution data above this many bytes is spooled to a temp file.
+SOLUTION_SPOOL_MEMORY = 4 * 1024 * 1024
+# Decoded page art keyed by (resolved path, mtime)
+_IMAGE_CACHE: Dict[Tuple[str, int], ImageReader] = {}
+
+
+# Page stream compression: "none" (readable streams), "fast" (ReportLab's
+# zlib), "max" (zlib plus the optimize_pdf post-pass at level 9).
+COMPRESSION_LEVELS = ("none", "fast", "max")
+
+
+@dataclass
+class BuildReport:
+    output: str
+    puzzles: int
+    pages: int
+    seconds: float
+    bytes: int
+    bytes_before: int = 0  # size before the optimization post-pass
+    compression: str = "none"
+    # Generation outcomes (see iter_puzzles), when the puzzles were built here.
+    outcomes: Dict[str, int] = field(default_factory=dict)
 
 
 def ensure_fonts() -> None:
-    """Register Biski font before generating PDF."""
-    try:
-        pdfmetrics.getFont(FONT_DISPLAY)
-    except KeyError:
-        register_biski_font()
+    """Register the display and text fonts; a font already seen is reused."""
+    global FONT_DISPLAY, FONT_TEXT
+    FONT_DISPLAY = register_ttf(find_font('display_font_path'))
+    FONT_TEXT = register_ttf(find_font('text_font_path'))
 
 
-def register_biski_font() -> None:
-    """Register BiskiTrial-Regular.ttf from --biski-path or common locations."""
+def find_font(key: str) -> Path:
+    """Locate a TTF from --biski-path, general.<key> or general.font_path."""
     candidates: list[Path] = []
 
     if USER_BISKI_PATH:
         candidates.append(USER_BISKI_PATH)
 
     # Add common paths (only .ttf, NOT .otf)
-    font_name = CONFIG.get('general', 'font_path')
-    candidates.extend([
-        Path(font_name),
-        Path(__file__).parent / font_name,
-        Path(__file__).parent.parent / font_name,
-    ])
+    for font_name in (CONFIG.get('general', key), CONFIG.get('general', 'font_path')):
+        if not font_name:
+            continue
+        candidates.extend([
+            Path(font_name),
+            Path(__file__).parent / font_name,
+            Path(__file__).parent.parent / font_name,
+        ])
 
     for candidate in candidates:
         if candidate.exists() and candidate.suffix.lower() == ".ttf":
-            pdfmetrics.registerFont(TTFont(FONT_DISPLAY, str(candidate)))
-            print(f"[generate_book] Registered Biski font from {candidate}")
-            return
+            return candidate
 
     raise FileNotFoundError(
         f"Biski TTF font not found. Tried: {[str(c) for c in candidates]}\n"
@@ -73,414 +128,718 @@ def register_biski_font() -> None:
     )
 
 
-def load_image_reader(asset_path: Path) -> ImageReader | None:
-    if asset_path.exists():
-        return ImageReader(str(asset_path))
-    return None
+class FontMetrics:
+    """Per-character advance widths for one (font, size), measured lazily."""
 
+    def __init__(self, font_name: str, font_size: float) -> None:
+        self.font_name = font_name
+        self.font_size = font_size
+        self._advances: Dict[str, float] = {}
 
-def draw_page_background(c: canvas.Canvas) -> None:
-    bg_color = CONFIG.get('page', 'background_color')
-    c.setFillColorRGB(*bg_color)
-    c.rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT, stroke=0, fill=1)
-    
-    box_color = CONFIG.get('page', 'box_color')
-    c.setFillColorRGB(*box_color)
-    border_radius = CONFIG.get('page', 'border_radius')
-    c.roundRect(MARGIN * 0.5, MARGIN * 0.5,
-                PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN,
-                border_radius, fill=1, stroke=0)
-    
-    border_color = CONFIG.get('page', 'border_color')
-    border_width = CONFIG.get('page', 'border_width')
-    c.setLineWidth(border_width)
-    c.setStrokeColorRGB(*border_color)
-    c.roundRect(MARGIN * 0.5, MARGIN * 0.5,
-                PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN,
-                border_radius, fill=0, stroke=1)
-
-
-def draw_page_number_box(c: canvas.Canvas, page_num: int) -> None:
-    """Draw styled page number box at bottom center with rounded top corners only."""
-    if not CONFIG.get('page_number', 'show'):
-        return
-    
-    box_width = CONFIG.get('page_number', 'box_width') * inch
-    box_height = CONFIG.get('page_number', 'box_height') * inch
-    box_x = (PAGE_WIDTH - box_width) / 2
-    box_y = CONFIG.get('page_number', 'position_from_bottom') * inch
-    radius = CONFIG.get('page_number', 'border_radius')
-    
-    box_color = CONFIG.get('page_number', 'box_color')
-    c.setFillColorRGB(*box_color)
-    
-    if CONFIG.get('page_number', 'rounded_top_only'):
-        # Draw custom shape with top corners rounded, bottom sharp
-        path = c.beginPath()
-        path.moveTo(box_x, box_y)
-        path.lineTo(box_x + box_width, box_y)
-        path.lineTo(box_x + box_width, box_y + box_height - radius)
-        path.arcTo(box_x + box_width - radius, box_y + box_height - radius,
-                   box_x + box_width, box_y + box_height,
-                   startAng=0, extent=90)
-        path.lineTo(box_x + radius, box_y + box_height)
-        path.arcTo(box_x, box_y + box_height - radius,
-                   box_x + radius, box_y + box_height,
-                   startAng=90, extent=90)
-        path.lineTo(box_x, box_y)
-        path.close()
-        c.drawPath(path, fill=1, stroke=0)
-    else:
-        c.roundRect(box_x, box_y, box_width, box_height, radius, fill=1, stroke=0)
-    
-    # Draw page number
-    text_color = CONFIG.get('page_number', 'text_color')
-    font_size = CONFIG.get('page_number', 'font_size')
-    c.setFont(FONT_DISPLAY, font_size)
-    c.setFillColorRGB(*text_color)
-    c.drawCentredString(PAGE_WIDTH / 2, box_y + 0.08 * inch, str(page_num))
+    def char_width(self, char: str) -> float:
+        width = self._advances.get(char)
+        if width is None:
+            width = pdfmetrics.stringWidth(char, self.font_name, self.font_size)
+            self._advances[char] = width
+        return width
 
+    def string_width(self, text: str) -> float:
+        return sum(self.char_width(char) for char in text)
 
-def draw_word_bank_page(
-    c: canvas.Canvas,
-    theme: str,
-    words: Sequence[str],
-    page_num: int,
-) -> None:
-    """Left page: theme + PNGs + 40-word box."""
-    draw_page_background(c)
 
-    # ALTERNATE images based on page number (ONLY ON WORD BANK PAGES)
-    if CONFIG.get('images', 'show'):
-        if CONFIG.get('images', 'alternate'):
-            if page_num % 2 == 1:
-                left_asset = ASSET_LEFT
-                right_asset = ASSET_RIGHT
-            else:
-                left_asset = ASSET_RIGHT
-                right_asset = ASSET_LEFT
-        else:
-            left_asset = ASSET_LEFT
-            right_asset = ASSET_RIGHT
-
-        # LEFT SIDE IMAGE
-        left_img = load_image_reader(left_asset)
-        if left_img:
-            img = Image.open(left_asset)
-            original_width, original_height = img.size
-            aspect_ratio = original_width / original_height
-            
-            max_height = CONFIG.get('images', 'max_height') * inch
-            img_height = max_height
-            img_width = img_height * aspect_ratio
-            
-            x_offset = CONFIG.get('images', 'position_x_offset') * inch
-            y_offset = CONFIG.get('images', 'position_y_offset') * inch
-            left_x = MARGIN * 0.5 + x_offset
-            left_y = PAGE_HEIGHT - MARGIN * 0.5 - img_height - y_offset
-            c.drawImage(left_img, left_x, left_y,
-                        width=img_width, height=img_height, mask="auto", 
-                        preserveAspectRatio=CONFIG.get('images', 'preserve_aspect_ratio'))
-
-        # RIGHT SIDE IMAGE
-        right_img = load_image_reader(right_asset)
-        if right_img:
-            img = Image.open(right_asset)
-            original_width, original_height = img.size
-            aspect_ratio = original_width / original_height
-            
-            max_height = CONFIG.get('images', 'max_height') * inch
-            img_height = max_height
-            img_width = img_height * aspect_ratio
-            
-            x_offset = CONFIG.get('images', 'position_x_offset') * inch
-            y_offset = CONFIG.get('images', 'position_y_offset') * inch
-            right_x = PAGE_WIDTH - MARGIN * 0.5 - img_width - x_offset
-            right_y = PAGE_HEIGHT - MARGIN * 0.5 - img_height - y_offset
-            c.drawImage(right_img, right_x, right_y,
-                        width=img_width, height=img_height, mask="auto",
-                        preserveAspectRatio=CONFIG.get('images', 'preserve_aspect_ratio'))
-
-    # Theme header
-    title_config = CONFIG.get('title')
-    c.setFont(FONT_DISPLAY, title_config['font_size'])
-    title_color = title_config['color']
-    c.setFillColorRGB(*title_color)
-    
-    title = theme.upper()
-    center_x = PAGE_WIDTH / 2
-    title_y = PAGE_HEIGHT - title_config['position_from_top'] * inch
-    
-    # Bold effect
-    if title_config['bold_effect']:
-        offset = title_config['bold_offset']
-        for off in [(-offset, 0), (offset, 0), (0, -offset), (0, offset)]:
-            c.drawCentredString(center_x + off[0], title_y + off[1], title)
-    
-    c.drawCentredString(center_x, title_y, title)
+@lru_cache(maxsize=512)
+def font_metrics(font_name: str, font_size: float) -> FontMetrics:
+    return FontMetrics(font_name, font_size)
 
-    # Word box
-    wb_config = CONFIG.get('word_box')
-    box_top = PAGE_HEIGHT - wb_config['position_from_top'] * inch
-    box_left = MARGIN + wb_config['margin_left'] * inch
-    box_right = PAGE_WIDTH - MARGIN - wb_config['margin_right'] * inch
+
+def load_image_reader(asset_path: Path) -> ImageReader | None:
+    """Decoded image for ``asset_path``, cached per process until the file changes."""
+    if not asset_path.exists():
+        return None
+    key = (str(asset_path.resolve()), asset_path.stat().st_mtime_ns)
+    reader = _IMAGE_CACHE.get(key)
+    if reader is None:
+        reader = ImageReader(str(asset_path))
+        _IMAGE_CACHE[key] = reader
+    return reader
+
+
+def reload_layout() -> None:
+    """Recompute the module-level page settings after CONFIG.data changed."""
+    global PAGE_WIDTH, PAGE_HEIGHT, MARGIN, ASSET_LEFT, ASSET_RIGHT
+    PAGE_WIDTH = CONFIG.get('page', 'width') * inch
+    PAGE_HEIGHT = CONFIG.get('page', 'height') * inch
+    MARGIN = CONFIG.get('page', 'margin') * inch
+    ASSET_LEFT = Path(CONFIG.get('images', 'left_image'))
+    ASSET_RIGHT = Path(CONFIG.get('images', 'right_image'))
+
+
+@dataclass(frozen=True)
+class WordBankEntry:
+    word: str
+    font_size: float
+    x: float  # left edge, already centred in its column
+    y: float
+
+
+def word_bank_layout(words: Sequence[str]) -> Tuple[WordBankEntry, ...]:
+    """Font size and position of every word in the word box.
+
+    Cached per theme word list and word-box/page settings, so re-rendering
+    with unchanged settings measures no text at all.
+    """
+    settings = json.dumps(CONFIG.get('word_box'), sort_keys=True)
+    return _word_bank_layout(tuple(words), settings, PAGE_WIDTH, PAGE_HEIGHT, MARGIN, FONT_TEXT)
+
+
+@lru_cache(maxsize=2048)
+def _word_bank_layout(
+    words: Tuple[str, ...],
+    settings: str,
+    page_width: float,
+    page_height: float,
+    margin: float,
+    font_name: str,
+) -> Tuple[WordBankEntry, ...]:
+    wb_config = json.loads(settings)
+    box_top = page_height - wb_config['position_from_top'] * inch
+    box_left = margin + wb_config['margin_left'] * inch
+    box_right = page_width - margin - wb_config['margin_right'] * inch
     box_width = box_right - box_left
     box_height = wb_config['height'] * inch
-    box_bottom = box_top - box_height
-
-    c.setLineWidth(wb_config['border_width'])
-    border_color = wb_config['border_color']
-    c.setStrokeColorRGB(*border_color)
-    bg_color = wb_config['background_color']
-    c.setFillColorRGB(*bg_color)
-    c.roundRect(box_left, box_bottom, box_width, box_height, 
-                wb_config['border_radius'], fill=1, stroke=1)
 
-    # Words - sorted by length, 4 columns, vertically centered
     cleaned = [w.upper() for w in words]
     if wb_config['sort_by_length']:
         cleaned.sort(key=len)
-    
-    if cleaned:
-        columns = wb_config['columns']
-        rows_per_column = wb_config['rows_per_column']
-        col_width = box_width / columns
-        
-        # Calculate total rows needed
-        total_rows = (len(cleaned) + columns - 1) // columns
-
-        usable_height = box_height - 0.5 * inch
-        row_spacing = usable_height / rows_per_column
-
-        # Better vertical centering
-        if wb_config['vertical_align'] == 'center':
-            vertical_offset = (box_height - (total_rows * row_spacing)) / 2
-        elif wb_config['vertical_align'] == 'top':
-            vertical_offset = 0
-        else:  # bottom
-            vertical_offset = box_height - (total_rows * row_spacing)
-        
-        base_font_size = wb_config['base_font_size']
-        min_font_size = wb_config['min_font_size']
-        max_width = col_width - 0.2 * inch
-        
-        c.setFillColor(colors.black)
-
-        for idx, word in enumerate(cleaned):
-            col = idx // rows_per_column
-            row = idx % rows_per_column
-            
-            if col >= columns:
-                break
-            
-            x = box_left + col * col_width + col_width / 2
-            y = box_top - vertical_offset - 0.25 * inch - row * row_spacing
-            
-            # Check if word fits at base size
-            text_width = c.stringWidth(word, FONT_TEXT, base_font_size)
-            
-            if text_width > max_width:
-                # Shrink long words
-                font_scale = max_width / text_width
-                actual_size = max(base_font_size * font_scale * 0.95, min_font_size)
-            else:
-                # Keep base size for short words
-                actual_size = base_font_size
-            
-            c.setFont(FONT_TEXT, actual_size)
-            c.drawCentredString(x, y, word)
+    if not cleaned:
+        return ()
+
+    columns = wb_config['columns']
+    rows_per_column = wb_config['rows_per_column']
+    col_width = box_width / columns
+
+    # Calculate total rows needed
+    total_rows = (len(cleaned) + columns - 1) // columns
+
+    usable_height = box_height - 0.5 * inch
+    row_spacing = usable_height / rows_per_column
+
+    # Better vertical centering
+    if wb_config['vertical_align'] == 'center':
+        vertical_offset = (box_height - (total_rows * row_spacing)) / 2
+    elif wb_config['vertical_align'] == 'top':
+        vertical_offset = 0
+    else:  # bottom
+        vertical_offset = box_height - (total_rows * row_spacing)
+
+    base_font_size = wb_config['base_font_size']
+    min_font_size = wb_config['min_font_size']
+    max_width = col_width - 0.2 * inch
+    base_metrics = font_metrics(font_name, base_font_size)
+
+    entries: List[WordBankEntry] = []
+    for idx, word in enumerate(cleaned):
+        col = idx // rows_per_column
+        row = idx % rows_per_column
+
+        if col >= columns:
+            break
+
+        x = box_left + col * col_width + col_width / 2
+        y = box_top - vertical_offset - 0.25 * inch - row * row_spacing
+
+        # Check if word fits at base size
+        text_width = base_metrics.string_width(word)
+
+        if text_width > max_width:
+            # Shrink long words
+            font_scale = max_width / text_width
+            actual_size = max(base_font_size * font_scale * 0.95, min_font_size)
+        else:
+            # Keep base size for short words
+            actual_size = base_font_size
 
-    draw_page_number_box(c, page_num)
+        width = font_metrics(font_name, actual_size).string_width(word)
+        entries.append(WordBankEntry(word, actual_size, x - width / 2, y))
+    return tuple(entries)
 
 
-def draw_puzzle_page(
-    c: canvas.Canvas,
-    theme: str,
-    rows: Sequence[str],
-    page_num: int,
-) -> None:
-    """Right page: puzzle grid - NO IMAGES."""
-    draw_page_background(c)
+@dataclass(frozen=True)
+class PageArt:
+    path: Path
+    x: float  # lower-left corner
+    y: float
+    width: float
+    height: float
 
-    # Theme header - SAME AS WORD BANK PAGE
-    title_config = CONFIG.get('title')
-    c.setFont(FONT_DISPLAY, title_config['font_size'])
-    title_color = title_config['color']
-    c.setFillColorRGB(*title_color)
-    
-    title = theme.upper()
-    center_x = PAGE_WIDTH / 2
-    title_y = PAGE_HEIGHT - title_config['position_from_top'] * inch
-    
-    # Bold effect
-    if title_config['bold_effect']:
-        offset = title_config['bold_offset']
-        for off in [(-offset, 0), (offset, 0), (0, -offset), (0, offset)]:
-            c.drawCentredString(center_x + off[0], title_y + off[1], title)
-    
-    c.drawCentredString(center_x, title_y, title)
 
-    # Puzzle grid
-    pg_config = CONFIG.get('puzzle_grid')
-    grid_size = len(rows)
-    usable_width = PAGE_WIDTH - 2 * MARGIN
-    usable_height = PAGE_HEIGHT - pg_config['position_from_top'] * inch - MARGIN
-    cell_size = min(usable_width / grid_size, usable_height / grid_size)
-    origin_x = (PAGE_WIDTH - cell_size * grid_size) / 2
-    origin_y = PAGE_HEIGHT - pg_config['position_from_top'] * inch - cell_size * grid_size
-
-    grid_color = pg_config['grid_line_color']
-    c.setLineWidth(pg_config['grid_line_width'])
-    c.setStrokeColorRGB(*grid_color)
-    for i in range(grid_size + 1):
-        c.line(origin_x, origin_y + i * cell_size,
-               origin_x + grid_size * cell_size, origin_y + i * cell_size)
-        c.line(origin_x + i * cell_size, origin_y,
-               origin_x + i * cell_size, origin_y + grid_size * cell_size)
-
-    letter_color = pg_config['letter_color']
-    letter_size = cell_size * pg_config['letter_font_size_factor']
-    letter_offset = pg_config['letter_vertical_offset']
-    c.setFont(FONT_DISPLAY, letter_size)
-    c.setFillColorRGB(*letter_color)
-    for row_idx, row in enumerate(rows):
-        for col_idx, letter in enumerate(row):
-            cx = origin_x + col_idx * cell_size + cell_size / 2
-            cy = origin_y + (grid_size - row_idx - 1) * cell_size + cell_size / 2
-            c.drawCentredString(cx, cy - (cell_size * letter_offset), letter)
+def page_art_layout(page_num: int) -> Tuple[PageArt, ...]:
+    """Corner images of a word bank page, swapped on even pages when alternating."""
+    if not CONFIG.get('images', 'show'):
+        return ()
+    if CONFIG.get('images', 'alternate') and page_num % 2 == 0:
+        left_asset, right_asset = ASSET_RIGHT, ASSET_LEFT
+    else:
+        left_asset, right_asset = ASSET_LEFT, ASSET_RIGHT
 
-    draw_page_number_box(c, page_num)
+    img_height = CONFIG.get('images', 'max_height') * inch
+    x_offset = CONFIG.get('images', 'position_x_offset') * inch
+    y_offset = CONFIG.get('images', 'position_y_offset') * inch
+    img_y = PAGE_HEIGHT - MARGIN * 0.5 - img_height - y_offset
 
+    arts = []
+    for asset, is_left in ((left_asset, True), (right_asset, False)):
+        reader = load_image_reader(asset)
+        if not reader:
+            continue
+        original_width, original_height = reader.getSize()
+        img_width = img_height * original_width / original_height
+        img_x = MARGIN * 0.5 + x_offset if is_left else PAGE_WIDTH - MARGIN * 0.5 - img_width - x_offset
+        arts.append(PageArt(asset, img_x, img_y, img_width, img_height))
+    return tuple(arts)
 
-def draw_solution_overlay(
-    c: canvas.Canvas,
-    placements: Sequence[PlacedWord],
+
+def grid_geometry(grid_size: int) -> GridGeometry:
+    position_from_top = CONFIG.get('puzzle_grid', 'position_from_top')
+    return _grid_geometry(grid_size, PAGE_WIDTH, PAGE_HEIGHT, MARGIN, position_from_top)
+
+
+@lru_cache(maxsize=256)
+def _grid_geometry(
     grid_size: int,
-    origin_x: float,
-    origin_y: float,
-    cell_size: float,
-) -> None:
+    page_width: float,
+    page_height: float,
+    margin: float,
+    position_from_top: float,
+) -> GridGeometry:
+    usable_width = page_width - 2 * margin
+    usable_height = page_height - position_from_top * inch - margin
+    cell_size = min(usable_width / grid_size, usable_height / grid_size)
+    origin_x = (page_width - cell_size * grid_size) / 2
+    origin_y = page_height - position_from_top * inch - cell_size * grid_size
+    return make_geometry(grid_size, cell_size, origin_x, origin_y)
+
+
+def solution_capsules(
+    placements: Sequence[PlacedWord],
+    geometry: GridGeometry,
+) -> Tuple[float, List[Tuple[float, float, float, float]]]:
+    """Capsule thickness and the padded ``(x1, y1, x2, y2)`` span of every word."""
     sol_config = CONFIG.get('solution')
-    highlight_color = sol_config['highlight_color']
-    bubble_color = colors.Color(highlight_color[0], highlight_color[1], highlight_color[2])
-    thickness = cell_size * sol_config['thickness_factor']
-    end_padding = cell_size * sol_config['end_padding_factor']
+    thickness = geometry.cell_size * sol_config['thickness_factor']
+    end_padding = geometry.cell_size * sol_config['end_padding_factor']
 
+    spans = []
     for placed in placements:
-        if not placed.path:
+        if not placed.word:
             continue
-        start = placed.path[0]
-        end = placed.path[-1]
-        start_x = origin_x + start[0] * cell_size + cell_size / 2
-        start_y = origin_y + (grid_size - start[1] - 1) * cell_size + cell_size / 2
-        end_x = origin_x + end[0] * cell_size + cell_size / 2
-        end_y = origin_y + (grid_size - end[1] - 1) * cell_size + cell_size / 2
+        start_x, start_y = geometry.center(placed.x, placed.y)
+        end_x, end_y = geometry.center(*placed.end)
 
         dx = end_x - start_x
         dy = end_y - start_y
         length = math.hypot(dx, dy)
 
         if length == 0:
-            c.setFillColor(bubble_color)
-            c.circle(start_x, start_y, thickness / 2, stroke=0, fill=1)
+            spans.append((start_x, start_y, start_x, start_y))
             continue
 
         pad_x = (dx / length) * end_padding
         pad_y = (dy / length) * end_padding
-        adj_start_x = start_x - pad_x
-        adj_start_y = start_y - pad_y
-        adj_end_x = end_x + pad_x
-        adj_end_y = end_y + pad_y
+        spans.append((start_x - pad_x, start_y - pad_y, end_x + pad_x, end_y + pad_y))
+    return thickness, spans
 
-        draw_capsule(c, adj_start_x, adj_start_y, adj_end_x, adj_end_y, thickness, bubble_color)
 
-
-def draw_capsule(
-    c: canvas.Canvas,
-    x1: float,
-    y1: float,
-    x2: float,
-    y2: float,
-    thickness: float,
-    color,
-) -> None:
-    radius = thickness / 2
+def capsule_axis(
+    x1: float, y1: float, x2: float, y2: float, thickness: float,
+) -> Tuple[float, float, float, float]:
+    """Centres of a capsule's two round ends, for backends that draw it as a
+    round-capped line: the caps then end exactly at the span's ends."""
     length = math.hypot(x2 - x1, y2 - y1)
     if length == 0:
-        c.setFillColor(color)
-        c.circle(x1, y1, radius, stroke=0, fill=1)
-        return
-    angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
-    mid_x = (x1 + x2) / 2
-    mid_y = (y1 + y2) / 2
-    c.saveState()
-    c.translate(mid_x, mid_y)
-    c.rotate(angle)
-    c.setFillColor(color)
-    c.roundRect(-length / 2, -radius, length, thickness, radius, stroke=0, fill=1)
-    c.restoreState()
+        return x1, y1, x2, y2
+    inset = min(thickness / 2, length / 2) / length
+    return (x1 + (x2 - x1) * inset, y1 + (y2 - y1) * inset,
+            x2 - (x2 - x1) * inset, y2 - (y2 - y1) * inset)
+
+
+@dataclass(frozen=True)
+class SolutionPage:
+    """One page of the solution section, planned before any of it is drawn."""
+    page_num: int
+    puzzles: Tuple[int, ...]  # 1-based puzzle numbers on this page
+
+
+def plan_solution_pages(num_puzzles: int, first_page: int, per_page: int = 1) -> List[SolutionPage]:
+    """Split the solution section into pages and number them up front."""
+    per_page = max(per_page, 1)
+    return [
+        SolutionPage(first_page + offset, tuple(range(start, min(start + per_page, num_puzzles + 1))))
+        for offset, start in enumerate(range(1, num_puzzles + 1, per_page))
+    ]
+
+
+def compact_tile_geometry(grid_size: int, tiles: int, slot: int) -> Tuple[GridGeometry, float]:
+    """Geometry of the ``slot``-th grid (row-major) on a ``tiles`` x ``tiles`` page.
+
+    Also returns the baseline for the tile's caption, just above its grid.
+    """
+    caption_size = CONFIG.get('solution', 'compact_caption_size') or 12
+    gap = (CONFIG.get('solution', 'compact_gap') or 0.0) * inch
+    bottom = MARGIN
+    if CONFIG.get('page_number', 'show'):
+        bottom = max(bottom, (CONFIG.get('page_number', 'position_from_bottom')
+                              + CONFIG.get('page_number', 'box_height')) * inch + gap)
+    top = PAGE_HEIGHT - CONFIG.get('puzzle_grid', 'position_from_top') * inch
+    usable_width = PAGE_WIDTH - 2 * MARGIN
+    return _compact_tile_geometry(grid_size, tiles, slot, MARGIN, usable_width, bottom, top,
+                                  gap, caption_size * 1.6)
 
 
-def draw_solution_page_full(
-    c: canvas.Canvas,
-    puzzle_page_num: int,
-    puzzle: WordSearchPuzzle,
-    page_num: int,
-) -> None:
-    """Solution page - NO IMAGES."""
-    draw_page_background(c)
+@lru_cache(maxsize=256)
+def _compact_tile_geometry(
+    grid_size: int,
+    tiles: int,
+    slot: int,
+    left: float,
+    usable_width: float,
+    bottom: float,
+    top: float,
+    gap: float,
+    caption_height: float,
+) -> Tuple[GridGeometry, float]:
+    tile_width = (usable_width - gap * (tiles - 1)) / tiles
+    tile_height = (top - bottom - gap * (tiles - 1)) / tiles
+    cell_size = min(tile_width, tile_height - caption_height) / grid_size
+    side = cell_size * grid_size
+
+    row, col = divmod(slot, tiles)
+    tile_left = left + col * (tile_width + gap)
+    tile_top = top - row * (tile_height + gap)
+    origin_x = tile_left + (tile_width - side) / 2
+    origin_y = tile_top - caption_height - side
+    geometry = make_geometry(grid_size, cell_size, origin_x, origin_y)
+    return geometry, tile_top - caption_height * 0.7
+
+
+# ---------------------------------------------------------------------------
+# Layout: pure functions from content + CONFIG to page models (page_model.py)
+# ---------------------------------------------------------------------------
+
+
+def layout_background() -> Tuple[Op, ...]:
+    page = CONFIG.get('page')
+    return (
+        Rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT, color(page['background_color'])),
+        RoundRect(MARGIN * 0.5, MARGIN * 0.5, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN,
+                  page['border_radius'], fill=color(page['box_color']),
+                  stroke=color(page['border_color']), line_width=page['border_width']),
+    )
+
 
-    # Title
+def layout_title(title: str) -> Tuple[Op, ...]:
+    """Centred page title; the bold effect is four offset copies under it."""
     title_config = CONFIG.get('title')
-    c.setFont(FONT_DISPLAY, title_config['font_size'])
-    title_color = title_config['color']
-    c.setFillColorRGB(*title_color)
-    
-    title = f"SOLUTION {puzzle_page_num}"
+    size = title_config['font_size']
+    fill = color(title_config['color'])
     center_x = PAGE_WIDTH / 2
     title_y = PAGE_HEIGHT - title_config['position_from_top'] * inch
-    
-    # Bold effect
+
+    offsets = [(0, 0)]
     if title_config['bold_effect']:
         offset = title_config['bold_offset']
-        for off in [(-offset, 0), (offset, 0), (0, -offset), (0, offset)]:
-            c.drawCentredString(center_x + off[0], title_y + off[1], title)
-    
-    c.drawCentredString(center_x, title_y, title)
+        offsets = [(-offset, 0), (offset, 0), (0, -offset), (0, offset)] + offsets
+    return tuple(TextRun(center_x + dx, title_y + dy, title, "display", size, fill, "center")
+                 for dx, dy in offsets)
+
+
+def layout_page_number(page_num: int) -> Tuple[Op, ...]:
+    """Styled page number box at bottom center, optionally rounded on top only."""
+    pn_config = CONFIG.get('page_number')
+    if not pn_config['show']:
+        return ()
+    box_width = pn_config['box_width'] * inch
+    box_height = pn_config['box_height'] * inch
+    box_x = (PAGE_WIDTH - box_width) / 2
+    box_y = pn_config['position_from_bottom'] * inch
+    return (
+        RoundRect(box_x, box_y, box_width, box_height, pn_config['border_radius'],
+                  fill=color(pn_config['box_color']), top_only=bool(pn_config['rounded_top_only'])),
+        TextRun(PAGE_WIDTH / 2, box_y + 0.08 * inch, str(page_num), "display",
+                pn_config['font_size'], color(pn_config['text_color']), "center"),
+    )
+
 
-    # Grid
+def grid_op(
+    rows: Sequence[str],
+    geometry: GridGeometry,
+    form: str | None = None,
+    form_geometry: GridGeometry | None = None,
+) -> Grid:
     pg_config = CONFIG.get('puzzle_grid')
-    rows = puzzle.as_rows()
-    grid_size = len(rows)
-    usable_width = PAGE_WIDTH - 2 * MARGIN
-    usable_height = PAGE_HEIGHT - pg_config['position_from_top'] * inch - MARGIN
-    cell_size = min(usable_width / grid_size, usable_height / grid_size)
-    origin_x = (PAGE_WIDTH - cell_size * grid_size) / 2
-    origin_y = PAGE_HEIGHT - pg_config['position_from_top'] * inch - cell_size * grid_size
-
-    draw_solution_overlay(c, puzzle.placements, grid_size, origin_x, origin_y, cell_size)
-
-    grid_color = pg_config['grid_line_color']
-    c.setLineWidth(pg_config['grid_line_width'])
-    c.setStrokeColorRGB(*grid_color)
-    for i in range(grid_size + 1):
-        c.line(origin_x, origin_y + i * cell_size,
-               origin_x + grid_size * cell_size, origin_y + i * cell_size)
-        c.line(origin_x + i * cell_size, origin_y,
-               origin_x + i * cell_size, origin_y + grid_size * cell_size)
-
-    letter_color = pg_config['letter_color']
-    letter_size = cell_size * pg_config['letter_font_size_factor']
-    letter_offset = pg_config['letter_vertical_offset']
-    c.setFont(FONT_DISPLAY, letter_size)
-    c.setFillColorRGB(*letter_color)
+    return Grid(
+        rows=tuple(rows),
+        geometry=geometry,
+        line_color=color(pg_config['grid_line_color']),
+        line_width=pg_config['grid_line_width'],
+        letter_color=color(pg_config['letter_color']),
+        letter_size=geometry.cell_size * pg_config['letter_font_size_factor'],
+        baseline_shift=geometry.cell_size * pg_config['letter_vertical_offset'],
+        form=form,
+        form_geometry=form_geometry,
+    )
+
+
+def capsule_ops(placements: Sequence[PlacedWord], geometry: GridGeometry) -> Tuple[Capsule, ...]:
+    fill = color(CONFIG.get('solution', 'highlight_color'))
+    thickness, spans = solution_capsules(placements, geometry)
+    words = [placed.word for placed in placements if placed.word]
+    return tuple(Capsule(*span, thickness, fill, word) for span, word in zip(spans, words))
+
+
+def layout_word_bank_page(theme: str, words: Sequence[str], page_num: int) -> Page:
+    """Left page: theme + PNGs + 40-word box."""
+    ops: List[Op] = list(layout_background())
+
+    # ALTERNATE images based on page number (ONLY ON WORD BANK PAGES)
+    preserve = bool(CONFIG.get('images', 'preserve_aspect_ratio'))
+    for art in page_art_layout(page_num):
+        ops.append(ImageRef(str(art.path), art.x, art.y, art.width, art.height, preserve))
+
+    ops.extend(layout_title(theme.upper()))
+
+    # Word box
+    wb_config = CONFIG.get('word_box')
+    box_top = PAGE_HEIGHT - wb_config['position_from_top'] * inch
+    box_left = MARGIN + wb_config['margin_left'] * inch
+    box_right = PAGE_WIDTH - MARGIN - wb_config['margin_right'] * inch
+    box_height = wb_config['height'] * inch
+    ops.append(RoundRect(box_left, box_top - box_height, box_right - box_left, box_height,
+                         wb_config['border_radius'], fill=color(wb_config['background_color']),
+                         stroke=color(wb_config['border_color']), line_width=wb_config['border_width']))
+
+    # Words - sorted by length, 4 columns, vertically centered
+    for entry in word_bank_layout(words):
+        ops.append(TextRun(entry.x, entry.y, entry.word, "text", entry.font_size, (0.0, 0.0, 0.0)))
+
+    ops.extend(layout_page_number(page_num))
+    return Page(PAGE_WIDTH, PAGE_HEIGHT, tuple(ops), "word_bank", page_num)
+
+
+def layout_puzzle_page(theme: str, rows: Sequence[str], page_num: int, grid_form: str | None = None) -> Page:
+    """Right page: puzzle grid - NO IMAGES."""
+    ops: List[Op] = list(layout_background())
+    ops.extend(layout_title(theme.upper()))
+    ops.append(grid_op(rows, grid_geometry(len(rows)), grid_form))
+    ops.extend(layout_page_number(page_num))
+    return Page(PAGE_WIDTH, PAGE_HEIGHT, tuple(ops), "puzzle", page_num)
+
+
+def layout_solution_page(
+    puzzle_idx: int,
+    puzzle: PuzzleResult,
+    page_num: int,
+    grid_form: str | None = None,
+) -> Page:
+    """Solution page - NO IMAGES. Capsules go under the grid so letters stay readable."""
+    geometry = grid_geometry(puzzle.size)
+    ops: List[Op] = list(layout_background())
+    ops.extend(layout_title(f"SOLUTION {puzzle_idx}"))
+    ops.extend(capsule_ops(puzzle.placements, geometry))
+    ops.append(grid_op(puzzle.as_rows(), geometry, grid_form))
+    ops.extend(layout_page_number(page_num))
+    return Page(PAGE_WIDTH, PAGE_HEIGHT, tuple(ops), "solution", page_num)
+
+
+def layout_compact_solution_page(
+    puzzles: Sequence[Tuple[int, PuzzleResult]],
+    page_num: int,
+    tiles: int,
+) -> Page:
+    """Solution page with up to ``tiles`` x ``tiles`` solved grids.
+
+    Each tile names its puzzle's grid form with the full-size geometry it was
+    captured at, so the PDF backend replays it scaled instead of laying it out again.
+    """
+    first, last = puzzles[0][0], puzzles[-1][0]
+    ops: List[Op] = list(layout_background())
+    ops.extend(layout_title(f"SOLUTIONS {first}-{last}" if last != first else f"SOLUTION {first}"))
+
+    caption_size = CONFIG.get('solution', 'compact_caption_size') or 12
+    caption_color = color(CONFIG.get('title', 'color'))
+    for slot, (puzzle_idx, puzzle) in enumerate(puzzles):
+        tile, caption_y = compact_tile_geometry(puzzle.size, tiles, slot)
+        ops.append(TextRun(tile.origin_x + tile.side / 2, caption_y, str(puzzle_idx), "display",
+                           caption_size, caption_color, "center"))
+        ops.extend(capsule_ops(puzzle.placements, tile))
+        ops.append(grid_op(puzzle.as_rows(), tile, grid_form_name(puzzle_idx), grid_geometry(puzzle.size)))
+
+    ops.extend(layout_page_number(page_num))
+    return Page(PAGE_WIDTH, PAGE_HEIGHT, tuple(ops), "solution", page_num)
+
+
+def layout_grid_figure(puzzle: PuzzleResult, solution: bool = False, cell_size: float = 32.0) -> Page:
+    """A bare grid (and optional solution) on a page of its own size, for per-puzzle exports."""
+    geometry = make_geometry(puzzle.size, cell_size, 0.0, 0.0)
+    ops: List[Op] = list(capsule_ops(puzzle.placements, geometry)) if solution else []
+    ops.append(grid_op(puzzle.as_rows(), geometry))
+    return Page(geometry.side, geometry.side, tuple(ops), "figure")
+
+
+# ---------------------------------------------------------------------------
+# ReportLab backend
+# ---------------------------------------------------------------------------
+
+
+def render_pdf_page(c: canvas.Canvas, page: Page) -> None:
+    """Draw a page model on the current canvas page."""
+    fonts = {"display": FONT_DISPLAY, "text": FONT_TEXT}
+    # Skip repeated font/colour changes between consecutive text runs.
+    current_font = current_fill = None
+    for op in batch_capsules(page.ops):
+        if isinstance(op, TextRun):
+            if (op.font, op.size) != current_font:
+                c.setFont(fonts[op.font], op.size)
+                current_font = (op.font, op.size)
+            if op.color != current_fill:
+                c.setFillColorRGB(*op.color)
+                current_fill = op.color
+            if op.align == "center":
+                c.drawCentredString(op.x, op.y, op.text)
+            else:
+                c.drawString(op.x, op.y, op.text)
+        elif isinstance(op, Rect):
+            c.setFillColorRGB(*op.fill)
+            c.rect(op.x, op.y, op.width, op.height, stroke=0, fill=1)
+        elif isinstance(op, RoundRect):
+            draw_round_rect(c, op)
+        elif isinstance(op, ImageRef):
+            c.drawImage(load_image_reader(Path(op.path)), op.x, op.y, width=op.width, height=op.height,
+                        mask="auto", preserveAspectRatio=op.preserve_aspect)
+        elif isinstance(op, tuple):
+            draw_capsules(c, op)
+        elif isinstance(op, Grid):
+            draw_grid(c, op)
+        else:
+            raise TypeError(f"Unknown page op: {op!r}")
+        if not isinstance(op, (TextRun, Grid)):
+            current_fill = None
+
+
+def draw_round_rect(c: canvas.Canvas, op: RoundRect) -> None:
+    if op.fill:
+        c.setFillColorRGB(*op.fill)
+    if op.stroke:
+        c.setLineWidth(op.line_width)
+        c.setStrokeColorRGB(*op.stroke)
+    if not op.top_only:
+        c.roundRect(op.x, op.y, op.width, op.height, op.radius,
+                    fill=1 if op.fill else 0, stroke=1 if op.stroke else 0)
+        return
+
+    # Custom shape with top corners rounded, bottom sharp
+    x, y, w, h, r = op.x, op.y, op.width, op.height, op.radius
+    path = c.beginPath()
+    path.moveTo(x, y)
+    path.lineTo(x + w, y)
+    path.lineTo(x + w, y + h - r)
+    path.arcTo(x + w - r, y + h - r, x + w, y + h, startAng=0, extent=90)
+    path.lineTo(x + r, y + h)
+    path.arcTo(x, y + h - r, x + r, y + h, startAng=90, extent=90)
+    path.lineTo(x, y)
+    path.close()
+    c.drawPath(path, fill=1 if op.fill else 0, stroke=1 if op.stroke else 0)
+
+
+def draw_grid(c: canvas.Canvas, op: Grid) -> None:
+    """Draw a grid, reusing its form when it was already captured on an earlier page."""
+    if not op.form:
+        draw_grid_body(c, op)
+        return
+
+    source = op.form_geometry or op.geometry
+    if not c.hasForm(op.form):
+        c.beginForm(op.form)
+        draw_grid_body(c, op if source == op.geometry else grid_op(op.rows, source))
+        c.endForm()
+
+    if source == op.geometry:
+        c.doForm(op.form)
+        return
+    scale = op.geometry.cell_size / source.cell_size
+    c.saveState()
+    c.translate(op.geometry.origin_x - source.origin_x * scale, op.geometry.origin_y - source.origin_y * scale)
+    c.scale(scale, scale)
+    c.doForm(op.form)
+    c.restoreState()
+
+
+def draw_grid_body(c: canvas.Canvas, op: Grid) -> None:
+    """Grid lines and letters: everything a puzzle and its solution share."""
+    c.setLineWidth(op.line_width)
+    c.setStrokeColorRGB(*op.line_color)
+    draw_grid_lines(c, op.geometry)
+
+    draw_grid_letters(c, op)
+
+
+def draw_grid_lines(c: canvas.Canvas, geometry: GridGeometry) -> None:
+    """Stroke every grid line as a single path."""
+    origin_x, origin_y, cell_size = geometry.origin_x, geometry.origin_y, geometry.cell_size
+    span = geometry.grid_size * cell_size
+    path = c.beginPath()
+    for i in range(geometry.grid_size + 1):
+        offset = i * cell_size
+        path.moveTo(origin_x, origin_y + offset)
+        path.lineTo(origin_x + span, origin_y + offset)
+        path.moveTo(origin_x + offset, origin_y)
+        path.lineTo(origin_x + offset, origin_y + span)
+    c.drawPath(path, stroke=1, fill=0)
+
+
+def pdf_text_hooks(
+    c: canvas.Canvas, font_name: str,
+) -> Tuple[Callable[[str], List[Tuple[str, str]]], Callable[[str], str]]:
+    """``(split, escape)`` for writing raw text operators with ``font_name``.
+
+    ``split(text)`` gives ``(internal font name, chunk)`` runs, one per font
+    subset, and ``escape`` quotes a PDF string. ReportLab has no public API
+    for either, so this reads private ``Canvas._doc``/``Canvas._escape`` and
+    ``TTFont._dynamicFont`` of the pinned reportlab==4.0.7. Keep every such
+    access here, so an upgrade that changes them fails in one place.
+    """
+    try:
+        doc = c._doc
+        escape = c._escape
+        font = pdfmetrics.getFont(font_name)
+        dynamic = font._dynamicFont
+    except AttributeError as exc:
+        raise RuntimeError(f"ReportLab {reportlab.Version} lacks an internal the grid text relies on: {exc}") from exc
+
+    if dynamic:
+        def split(text: str) -> List[Tuple[str, str]]:
+            return [(font.getSubsetInternalName(subset, doc), chunk) for subset, chunk in font.splitString(text, doc)]
+    else:
+        internal_name = doc.getInternalFontName(font_name)
+
+        def split(text: str) -> List[Tuple[str, str]]:
+            return [(internal_name, text)]
+    return split, escape
+
+
+def draw_grid_letters(c: canvas.Canvas, op: Grid) -> None:
+    """Draw all grid letters in one text object, one TJ array per row.
+
+    Each letter is centred in its cell using cached glyph widths: the row
+    starts at the first letter's left edge and the TJ kerning numbers move
+    the pen from one letter's right edge to the next letter's left edge.
+    """
+    rows, geometry = op.rows, op.geometry
+    cell_size = geometry.cell_size
+    font_size = op.letter_size
+    baseline_shift = op.baseline_shift
+    metrics = font_metrics(FONT_DISPLAY, font_size)
+    split, escape = pdf_text_hooks(c, FONT_DISPLAY)
+
+    ops = ["q BT", "%s rg" % fp_str(*op.letter_color)]
+    current_font = None
     for row_idx, row in enumerate(rows):
-        for col_idx, letter in enumerate(row):
-            cx = origin_x + col_idx * cell_size + cell_size / 2
-            cy = origin_y + (grid_size - row_idx - 1) * cell_size + cell_size / 2
-            c.drawCentredString(cx, cy - (cell_size * letter_offset), letter)
+        if not row:
+            continue
+        widths = [metrics.char_width(letter) for letter in row]
+        y = geometry.row_centers[row_idx] - baseline_shift
+        x = geometry.col_centers[0] - widths[0] / 2
+        ops.append("1 0 0 1 %s Tm" % fp_str(x, y))
+
+        col = 0
+        for pdf_font, text in split(row):
+            if pdf_font != current_font:
+                ops.append("%s %s Tf" % (pdf_font, fp_str(font_size)))
+                current_font = pdf_font
+            items = []
+            for i in range(len(text)):
+                if items:
+                    gap = cell_size - (widths[col - 1] + widths[col]) / 2
+                    items.append(fp_str(-gap * 1000.0 / font_size))
+                items.append("(%s)" % escape(text[i:i + 1]))
+                col += 1
+            ops.append("[%s] TJ" % " ".join(items))
+            if col < len(row):
+                # Next chunk uses another font subset: restart at its cell.
+                x = geometry.col_centers[col] - widths[col] / 2
+                ops.append("1 0 0 1 %s Tm" % fp_str(x, y))
+    ops.append("ET Q")
+    c.addLiteral("\n".join(ops))
+
+
+def batch_capsules(ops: Iterable[Op]) -> Iterator[Op | Tuple[Capsule, ...]]:
+    """Pass ops through, merging runs of same-coloured capsules into one tuple."""
+    run: List[Capsule] = []
+    for op in ops:
+        if isinstance(op, Capsule) and (not run or op.color == run[0].color):
+            run.append(op)
+            continue
+        if run:
+            yield tuple(run)
+            run = []
+        if isinstance(op, Capsule):
+            run.append(op)
+        else:
+            yield op
+    if run:
+        yield tuple(run)
+
+
+def draw_capsules(c: canvas.Canvas, capsules: Sequence[Capsule]) -> None:
+    """Fill same-coloured capsules as one path, outlined directly in page coordinates.
+
+    Every outline is traced in the same direction, so with the non-zero
+    winding rule overlapping capsules merge instead of cancelling out.
+    """
+    path = c.beginPath()
+    for op in capsules:
+        radius = op.thickness / 2
+        ax, ay, bx, by = capsule_axis(op.x1, op.y1, op.x2, op.y2, op.thickness)
+        length = math.hypot(bx - ax, by - ay)
+        if length == 0:
+            path.circle(ax, ay, radius)
+            continue
+        # Unit normal to the left of the axis, and its angle
+        nx, ny = -(by - ay) / length * radius, (bx - ax) / length * radius
+        normal_angle = math.degrees(math.atan2(ny, nx))
+        # arcTo joins the previous point to the arc's start with a straight side
+        path.moveTo(ax + nx, ay + ny)
+        path.arcTo(bx - radius, by - radius, bx + radius, by + radius,
+                   startAng=normal_angle, extent=-180)
+        path.arcTo(ax - radius, ay - radius, ax + radius, ay + radius,
+                   startAng=normal_angle + 180, extent=-180)
+        path.close()
+    c.setFillColorRGB(*capsules[0].color)
+    c.drawPath(path, stroke=0, fill=1, fillMode=FILL_NON_ZERO)
+
+
+def draw_word_bank_page(c: canvas.Canvas, theme: str, words: Sequence[str], page_num: int) -> None:
+    render_pdf_page(c, layout_word_bank_page(theme, words, page_num))
+
+
+def draw_puzzle_page(
+    c: canvas.Canvas,
+    theme: str,
+    rows: Sequence[str],
+    page_num: int,
+    grid_form: str | None = None,
+) -> None:
+    render_pdf_page(c, layout_puzzle_page(theme, rows, page_num, grid_form))
+
 
-    draw_page_number_box(c, page_num)
+def draw_solution_page_full(
+    c: canvas.Canvas,
+    puzzle_page_num: int,
+    puzzle: PuzzleResult,
+    page_num: int,
+    grid_form: str | None = None,
+) -> None:
+    render_pdf_page(c, layout_solution_page(puzzle_page_num, puzzle, page_num, grid_form))
 
 
 def debug_puzzles() -> None:
@@ -495,80 +854,374 @@ def debug_puzzles() -> None:
         print(f"  Theme: {theme} ({len(words)} words) sample: {words[:5]}")
 
 
-def build_puzzles(count: int, size: int, seed: int) -> List[Tuple[dict, WordSearchPuzzle]]:
-    puzzles: List[Tuple[dict, WordSearchPuzzle]] = []
+def iter_puzzles(
+    count: int,
+    size: int,
+    seed: int,
+    fill_mode: str | None = None,
+    difficulty: str | None = None,
+    outcomes: Counter | None = None,
+    source_indexes: Collection[int] | None = None,
+) -> Iterator[Tuple[dict, PuzzleResult]]:
+    """Lazily generate up to ``count`` puzzles, frozen as compact PuzzleResults.
+
+    The bank is visited in order, pass after pass; visit ``n`` (1-based, the
+    ``source_index`` in each puzzle's data) uses theme ``(n - 1) % len(PUZZLES)``
+    and seed ``seed + n``, or the seed table's on the first pass. A puzzle's
+    randomness derives from that seed and its theme alone, so
+    ``source_indexes`` regenerates only those visits, identical to their
+    puzzles in the full book (unless a budget cut them short); see
+    rebuild_puzzle.
+
+    Each puzzle may spend ``puzzle_time_budget`` seconds / ``puzzle_op_budget``
+    placement previews, and the whole run ``book_time_budget`` seconds /
+    ``book_op_budget`` previews. With
+    ``drop_unplaceable_words`` a word that does not fit (or every word left
+    when the budget runs out) is dropped from the puzzle and its word bank
+    instead of losing the theme. ``outcomes`` counts what happened: complete,
+    shrunk and failed puzzles, dropped words, exceeded budgets, and
+    generations whose constrained filler could not avoid a forbidden word.
+    """
+    produced = 0
     src_idx = 0
     safety = 0
     max_safety = max(len(PUZZLES) * 10, 1)
+    pending = None
+    if source_indexes is not None:
+        pending = sorted(set(source_indexes), reverse=True)
+        max_safety = len(pending)
     min_words = CONFIG.get('puzzle_generation', 'min_words_per_puzzle')
+    fill_mode = fill_mode or CONFIG.get('puzzle_generation', 'fill_mode') or "random"
+    banned_words = CONFIG.get('puzzle_generation', 'banned_words') or []
+    letter_profile = CONFIG.get('puzzle_generation', 'letter_profile') or "uniform"
+    letter_weights = LETTER_PROFILES[letter_profile]
+    placement = CONFIG.get('puzzle_generation', 'placement') or "length"
+    difficulty = difficulty or CONFIG.get('puzzle_generation', 'difficulty')
+    difficulty_attempts = CONFIG.get('puzzle_generation', 'difficulty_attempts') or 24
+    puzzle_seconds = CONFIG.get('puzzle_generation', 'puzzle_time_budget')
+    puzzle_ops = CONFIG.get('puzzle_generation', 'puzzle_op_budget')
+    drop_unplaceable = bool(CONFIG.get('puzzle_generation', 'drop_unplaceable_words'))
+    book_budget = Budget.start(
+        CONFIG.get('puzzle_generation', 'book_time_budget'),
+        CONFIG.get('puzzle_generation', 'book_op_budget'),
+    )
+    outcomes = Counter() if outcomes is None else outcomes
+    scores = []
+    misses = 0
+    # Seeds found by `python -m src.seed_search` for this size/placement/seed/filler:
+    # those themes are generated in one attempt on the first pass over the bank.
+    seed_table = {} if difficulty else load_seed_table(
+        PUZZLE_FILE, size, placement, seed,
+        [(position, bank_usable_words(data, size)) for position, data in enumerate(PUZZLES)],
+        fill_mode, letter_profile, banned_words,
+    )
+    if seed_table:
+        known = sum(1 for table_seed in seed_table.values() if table_seed is not None)
+        print(f"[generate_book] Seed table: {known} themes with a known seed, "
+              f"{len(seed_table) - known} known to fail")
     
-    while len(puzzles) < count and safety < max_safety:
-        data = PUZZLES[src_idx % len(PUZZLES)]
-        usable_words = [w for w in data["words"] if len(w.replace(" ", "")) <= size]
+    while produced < count and safety < max_safety:
+        if book_budget is not None and book_budget.exhausted:
+            outcomes["book_budget_exceeded"] += 1
+            print(f"[generate_book] Book budget spent after {produced} puzzles")
+            break
+        if pending is not None:
+            src_idx = pending.pop() - 1
+        position = src_idx % len(PUZZLES)
+        data = PUZZLES[position]
         src_idx += 1
         safety += 1
+        if str(size) in data.get("fits", {}) and data["fits"][str(size)] < min_words:
+            continue  # compiled bank: the per-size word count is precomputed (GRID_SIZES only)
+        usable_words = bank_usable_words(data, size)
         if len(usable_words) < min_words:
             continue
-        puzzle = WordSearchPuzzle(size=size, words=usable_words, seed=seed + src_idx)
+        puzzle_seed = seed + src_idx
+        if src_idx <= len(PUZZLES) and position in seed_table:
+            if seed_table[position] is None:
+                continue
+            puzzle_seed = seed_table[position]
+        budget = Budget.start(puzzle_seconds, puzzle_ops, book_budget)
+        budget_kwargs = dict(budget=budget, drop_unplaceable=drop_unplaceable, min_words=min_words)
+        if difficulty:
+            targeted = generate_for_difficulty(
+                usable_words,
+                size,
+                difficulty,
+                seed=seed + src_idx,
+                max_attempts=difficulty_attempts,
+                banned_words=banned_words,
+                letter_weights=letter_weights,
+                placement=placement,
+                theme=data["theme"],
+                **budget_kwargs,
+            )
+            outcomes["fill_failed"] += targeted.fill_failures
+            if targeted.puzzle is None:
+                outcomes["failed"] += 1
+                outcomes["budget_exceeded"] += over_budget(budget)
+                continue
+            if not targeted.hit:
+                misses += 1
+            scores.append(targeted.difficulty)
+            produced += 1
+            words = count_outcome(outcomes, usable_words, targeted.puzzle.dropped)
+            yield (
+                {"theme": data["theme"], "words": words, "position": position, "source_index": src_idx,
+                 "difficulty": targeted.difficulty.score},
+                targeted.puzzle.result(),
+            )
+            continue
+        puzzle = WordSearchPuzzle(
+            size=size,
+            words=usable_words,
+            seed=puzzle_seed,
+            fill_mode=fill_mode,
+            banned_words=banned_words,
+            letter_weights=letter_weights,
+            placement=placement,
+            theme=data["theme"],
+            **budget_kwargs,
+        )
         try:
             puzzle.generate()
-        except RuntimeError:
+        except RuntimeError as exc:  # BudgetExceeded included
+            outcomes["failed"] += 1
+            outcomes["budget_exceeded"] += isinstance(exc, BudgetExceeded) or over_budget(budget)
+            outcomes["fill_failed"] += isinstance(exc, FillFailed)
             continue
-        puzzles.append(({"theme": data["theme"], "words": usable_words}, puzzle))
-    return puzzles
+        produced += 1
+        words = count_outcome(outcomes, usable_words, puzzle.dropped)
+        yield (
+            {"theme": data["theme"], "words": words, "position": position, "source_index": src_idx},
+            puzzle.result(),
+        )
+
+    if difficulty:
+        print(f"[generate_book] Difficulty '{difficulty}': {summarize(scores)} "
+              f"({misses} outside target band)")
+    if outcomes["shrunk"] or outcomes["budget_exceeded"] or outcomes["fill_failed"]:
+        print(f"[generate_book] Outcomes: {outcomes['complete']} complete, {outcomes['shrunk']} shrunk "
+              f"({outcomes['words_dropped']} words dropped), {outcomes['failed']} failed, "
+              f"{outcomes['budget_exceeded']} over budget")
+    if outcomes["fill_failed"]:
+        print(f"[generate_book] {outcomes['fill_failed']} generations had no filler free of forbidden "
+              "words: puzzle_generation.banned_words may be too strict")
+
+
+def rebuild_puzzle(
+    source_index: int,
+    size: int,
+    seed: int,
+    fill_mode: str | None = None,
+    difficulty: str | None = None,
+) -> Tuple[dict, PuzzleResult] | None:
+    """The puzzle from bank visit ``source_index`` of a book built with these settings.
+
+    ``source_index`` is recorded in each puzzle's data. Only that visit is
+    generated; None when it fails, in which case the book has no puzzle for it.
+    """
+    return next(iter_puzzles(1, size, seed, fill_mode, difficulty, source_indexes={source_index}), None)
+
+
+def over_budget(budget: Budget | None) -> bool:
+    return budget is not None and budget.exhausted
+
+
+def count_outcome(outcomes: Counter, words: List[str], dropped: Sequence[str]) -> List[str]:
+    """Record a produced puzzle in ``outcomes``; return its word bank without ``dropped``."""
+    if not dropped:
+        outcomes["complete"] += 1
+        return words
+    outcomes["shrunk"] += 1
+    outcomes["words_dropped"] += len(dropped)
+    left = Counter(dropped)
+    kept = []
+    for word in words:
+        key = word.upper().replace(" ", "")
+        if left[key]:
+            left[key] -= 1
+        else:
+            kept.append(word)
+    return kept
 
 
-def generate_pdf(
-    output: Path,
+def build_puzzles(
     count: int,
     size: int,
     seed: int,
-    biski_path: Path | None = None,
-    compact_solutions: bool = False,
-) -> None:
-    global USER_BISKI_PATH
-    USER_BISKI_PATH = biski_path
-    ensure_fonts()
+    fill_mode: str | None = None,
+    difficulty: str | None = None,
+    outcomes: Counter | None = None,
+) -> List[Tuple[dict, PuzzleResult]]:
+    return list(iter_puzzles(count, size, seed, fill_mode, difficulty, outcomes))
 
-    c = canvas.Canvas(str(output), pagesize=(PAGE_WIDTH, PAGE_HEIGHT), pageCompression=0)
-    c.setPageCompression(0)
 
-    debug_puzzles()
-    puzzles = build_puzzles(count, size, seed)
-    num_puzzles = len(puzzles)
+def grid_form_name(puzzle_idx: int) -> str:
+    return f"PuzzleGrid{puzzle_idx}"
 
-    solution_pages = num_puzzles if CONFIG.get('solution', 'show_solutions') else 0
 
-    total_pages = (num_puzzles * 2) + solution_pages
-    print(f"Generating {num_puzzles} puzzles ({total_pages} pages)...")
+class SolutionSpool:
+    """Append-only store of solution data for the section at the end of the book.
 
-    page_num = 1
+    Records are length-prefixed ``PuzzleResult.to_bytes()`` blobs in a spooled
+    temp file: kept in memory up to ``max_memory`` bytes, then moved to disk.
+    """
 
-    for idx, (data, puzzle) in enumerate(puzzles, start=1):
-        if idx % 10 == 0:
-            print(f"  Progress: {idx}/{num_puzzles} puzzles...")
+    def __init__(self, max_memory: int = SOLUTION_SPOOL_MEMORY) -> None:
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self.count = 0
 
-        draw_word_bank_page(c, data["theme"], data["words"], page_num)
-        c.showPage()
-        page_num += 1
+    def append(self, puzzle: PuzzleResult) -> None:
+        blob = puzzle.to_bytes()
+        self._file.write(struct.pack("<I", len(blob)))
+        self._file.write(blob)
+        self.count += 1
 
-        draw_puzzle_page(c, data["theme"], puzzle.as_rows(), page_num)
-        c.showPage()
-        page_num += 1
+    def __iter__(self) -> Iterator[PuzzleResult]:
+        self._file.seek(0)
+        for _ in range(self.count):
+            (length,) = struct.unpack("<I", self._file.read(4))
+            yield PuzzleResult.from_bytes(self._file.read(length))
+        self._file.seek(0, 2)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def iter_book_pages(
+    count: int,
+    size: int,
+    seed: int,
+    fill_mode: str | None = None,
+    difficulty: str | None = None,
+    puzzles: Iterable[Tuple[dict, PuzzleResult]] | None = None,
+    compact_solutions: bool | None = None,
+    compact_tiles: int | None = None,
+    outcomes: Counter | None = None,
+) -> Iterator[Page]:
+    """Page models of the whole book, in order, for any backend.
+
+    Puzzle pages are laid out as soon as each puzzle is generated; only the
+    compact solution data is kept for the solution section.
+    """
+    ensure_fonts()  # the word bank layout measures text with the registered font
+    debug_puzzles()
+    show_solutions = CONFIG.get('solution', 'show_solutions')
+    print(f"Generating up to {count} puzzles...")
 
-    if CONFIG.get('solution', 'show_solutions'):
+    spool = SolutionSpool()
+    page_num = 1
+    num_puzzles = 0
+
+    if puzzles is None:
+        puzzles = iter_puzzles(count, size, seed, fill_mode, difficulty, outcomes)
+
+    try:
         for idx, (data, puzzle) in enumerate(puzzles, start=1):
-            if idx % 5 == 0:
-                print(f"  Solution pages: {idx}/{num_puzzles}...")
-            puzzle_page = idx
-            draw_solution_page_full(c, puzzle_page, puzzle, page_num)
-            c.showPage()
-            page_num += 1
+            if idx % 10 == 0:
+                print(f"  Progress: {idx}/{count} puzzles...")
+
+            yield layout_word_bank_page(data["theme"], data["words"], page_num)
+            yield layout_puzzle_page(data["theme"], puzzle.as_rows(), page_num + 1, grid_form_name(idx))
+            page_num += 2
+
+            if show_solutions:
+                spool.append(puzzle)
+            num_puzzles = idx
+
+        if not show_solutions:
+            return
+        if compact_solutions is None:
+            compact_solutions = bool(CONFIG.get('solution', 'compact'))
+        tiles = max(compact_tiles or CONFIG.get('solution', 'compact_tiles') or 2, 1) if compact_solutions else 1
+        plan = plan_solution_pages(num_puzzles, page_num, tiles * tiles)
+        solutions = enumerate(spool, start=1)
+        for sheet_idx, sheet in enumerate(plan, start=1):
+            if sheet_idx % 5 == 0:
+                print(f"  Solution pages: {sheet_idx}/{len(plan)}...")
+            if compact_solutions:
+                batch = [next(solutions) for _ in sheet.puzzles]
+                yield layout_compact_solution_page(batch, sheet.page_num, tiles)
+            else:
+                idx, puzzle = next(solutions)
+                yield layout_solution_page(idx, puzzle, sheet.page_num, grid_form_name(idx))
+    finally:
+        spool.close()
+
+
+def generate_pdf(
+    output: Path,
+    count: int,
+    size: int,
+    seed: int,
+    biski_path: Path | None = None,
+    compact_solutions: bool | None = None,
+    fill_mode: str | None = None,
+    difficulty: str | None = None,
+    puzzles: Iterable[Tuple[dict, PuzzleResult]] | None = None,
+    compression: str | None = None,
+    optimize: bool | None = None,
+    compact_tiles: int | None = None,
+) -> BuildReport:
+    """Render the book to ``output``.
+
+    ``puzzles`` lets a caller (e.g. the batch runner) supply already generated
+    puzzles; otherwise they are generated lazily from the bank.
+    ``compact_solutions`` tiles ``compact_tiles`` x ``compact_tiles`` solutions
+    per page instead of one.
+    """
+    global USER_BISKI_PATH
+    started = time.perf_counter()
+    USER_BISKI_PATH = biski_path
+    ensure_fonts()
+
+    compression = compression or CONFIG.get('general', 'compression') or "fast"
+    if compression not in COMPRESSION_LEVELS:
+        raise ValueError(f"Unknown compression: {compression!r} (expected one of {COMPRESSION_LEVELS})")
+    if optimize is None:
+        optimize = bool(CONFIG.get('general', 'optimize_pdf'))
+    optimize = optimize or compression == "max"
+
+    page_compression = 0 if compression == "none" else 1
+    c = canvas.Canvas(str(output), pagesize=(PAGE_WIDTH, PAGE_HEIGHT), pageCompression=page_compression)
+
+    num_puzzles = 0
+    num_pages = 0
+    outcomes: Counter = Counter()
+    for page in iter_book_pages(count, size, seed, fill_mode, difficulty, puzzles,
+                                compact_solutions, compact_tiles, outcomes):
+        render_pdf_page(c, page)
+        c.showPage()
+        num_pages += 1
+        if page.kind == "puzzle":
+            num_puzzles += 1
 
     c.save()
-    print(f"[INFO] Generating {num_puzzles} puzzles ({total_pages} pages)...")
+    print(f"[INFO] Generated {num_puzzles} puzzles ({num_pages} pages)")
     USER_BISKI_PATH = None
 
+    bytes_before = Path(output).stat().st_size
+    bytes_after = bytes_before
+    if optimize:
+        try:
+            bytes_before, bytes_after = optimize_pdf(Path(output), level=9 if compression == "max" else 6)
+        except RuntimeError as exc:
+            print(f"[generate_book] Skipping optimization: {exc}")
+    print(f"[generate_book] Size ({compression}): {bytes_before / 1024:.1f} KB -> {bytes_after / 1024:.1f} KB "
+          f"({(bytes_after - bytes_before) * 100 / max(bytes_before, 1):+.1f}%)")
+
+    return BuildReport(
+        output=str(output),
+        puzzles=num_puzzles,
+        pages=num_pages,
+        seconds=round(time.perf_counter() - started, 3),
+        bytes=bytes_after,
+        bytes_before=bytes_before,
+        compression=compression,
+        outcomes=dict(outcomes),
+    )
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Winter Word Search Book Generator")
@@ -584,13 +1237,23 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--size", type=int, default=default_size, help="Grid size (NxN)")
     parser.add_argument("--seed", type=int, default=default_seed, help="Random seed")
     parser.add_argument("--biski-path", type=Path, help="Biski TTF font path (optional)")
-    parser.add_argument("--compact-solutions", action="store_true", help="(Ignored - always 1 per page)")
+    parser.add_argument("--compact-solutions", action="store_true", default=None,
+                        help="Tile several solutions per page")
+    parser.add_argument("--compact-tiles", type=int,
+                        help="Solutions per row/column in compact mode (default from config, 2 = 2x2)")
+    parser.add_argument("--fill-mode", choices=FILL_MODES, help="Filler letters: random or constrained")
+    parser.add_argument("--difficulty", choices=tuple(BANDS), help="Target difficulty band for every puzzle")
+    parser.add_argument("--compression", choices=COMPRESSION_LEVELS, help="PDF stream compression")
+    parser.add_argument("--optimize", action="store_true", default=None,
+                        help="Deduplicate objects and recompress streams after rendering (needs pypdf)")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    generate_pdf(args.output, args.count, args.size, args.seed, args.biski_path, args.compact_solutions)
+    generate_pdf(args.output, args.count, args.size, args.seed, args.biski_path, args.compact_solutions,
+                 args.fill_mode, args.difficulty, compression=args.compression, optimize=args.optimize,
+                 compact_tiles=args.compact_tiles)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple, Union
+
+
+# Page models: what goes on a page as a flat list of primitive ops, in page
+# points with the origin at the bottom-left (PDF convention). Layout
+# functions in generate_book build them; the ReportLab, raster and SVG
+# backends draw them.
+
+Color = Tuple[float, float, float]
+
+
+def color(value) -> Color:
+    """Config colours are lists; ops keep hashable tuples."""
+    return tuple(float(channel) for channel in value[:3])
+
+
+@dataclass(frozen=True)
+class GridGeometry:
+    """Placement of an NxN grid on the page, shared by puzzle and solution pages."""
+    grid_size: int
+    cell_size: float
+    origin_x: float  # lower-left corner of the grid
+    origin_y: float
+    col_centers: array  # x of each column's cell centres
+    row_centers: array  # y of each row's cell centres, row 0 at the top
+
+    def __hash__(self) -> int:
+        # The centre arrays are derived from the other fields.
+        return hash((self.grid_size, self.cell_size, self.origin_x, self.origin_y))
+
+    def center(self, x: int, y: int) -> Tuple[float, float]:
+        return self.col_centers[x], self.row_centers[y]
+
+    @property
+    def side(self) -> float:
+        return self.cell_size * self.grid_size
+
+
+def make_geometry(grid_size: int, cell_size: float, origin_x: float, origin_y: float) -> GridGeometry:
+    return GridGeometry(
+        grid_size=grid_size,
+        cell_size=cell_size,
+        origin_x=origin_x,
+        origin_y=origin_y,
+        col_centers=array("d", (origin_x + i * cell_size + cell_size / 2 for i in range(grid_size))),
+        row_centers=array("d", (origin_y + (grid_size - i - 1) * cell_size + cell_size / 2
+                                for i in range(grid_size))),
+    )
+
+
+@dataclass(frozen=True)
+class Rect:
+    x: float
+    y: float
+    width: float
+    height: float
+    fill: Color
+
+
+@dataclass(frozen=True)
+class RoundRect:
+    x: float
+    y: float
+    width: float
+    height: float
+    radius: float
+    fill: Optional[Color] = None
+    stroke: Optional[Color] = None
+    line_width: float = 1.0
+    top_only: bool = False  # round the top corners only
+
+
+@dataclass(frozen=True)
+class TextRun:
+    x: float  # left edge, or centre when align == "center"
+    y: float  # baseline
+    text: str
+    font: str  # "display" or "text"
+    size: float
+    color: Color
+    align: str = "left"
+
+
+@dataclass(frozen=True)
+class ImageRef:
+    path: str
+    x: float
+    y: float
+    width: float
+    height: float
+    preserve_aspect: bool = True
+
+
+@dataclass(frozen=True)
+class Capsule:
+    """Rounded bar covering ``(x1, y1)``-``(x2, y2)``, ends included."""
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    thickness: float
+    color: Color
+    word: str = ""
+
+
+@dataclass(frozen=True)
+class Grid:
+    """Grid lines and letters.
+
+    ``form`` names a reusable drawing of this grid; ``form_geometry`` is where
+    that drawing was laid out when it differs from ``geometry`` (e.g. a scaled
+    solution tile), so backends that reuse it know the transform.
+    """
+    rows: Tuple[str, ...]
+    geometry: GridGeometry
+    line_color: Color
+    line_width: float
+    letter_color: Color
+    letter_size: float
+    baseline_shift: float
+    form: Optional[str] = None
+    form_geometry: Optional[GridGeometry] = None
+
+
+Op = Union[Rect, RoundRect, TextRun, ImageRef, Capsule, Grid]
+
+
+@dataclass(frozen=True)
+class Page:
+    width: float
+    height: float
+    ops: Tuple[Op, ...]
+    kind: str = ""  # "word_bank", "puzzle", "solution", "figure"
+    page_num: int = 0
+
+    def __iter__(self) -> Iterator[Op]:
+        return iter(self.ops)
+
+    def digest(self) -> str:
+        """Stable content hash, e.g. to cache renders or skip unchanged pages."""
+        return hashlib.sha1(repr((self.width, self.height, self.ops)).encode("utf-8")).hexdigest()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Tuple
+
+
+def optimize_pdf(path: Path, output: Path | None = None, level: int = 9) -> Tuple[int, int]:
+    """Rewrite a finished PDF smaller; return ``(bytes_before, bytes_after)``.
+
+    Page content streams and form XObjects are (re)compressed at ``level``,
+    then byte-identical objects (repeated images, forms, font programs) are
+    merged and orphans dropped. Needs the optional ``pypdf`` package.
+    ReportLab already embeds TrueType fonts as subsets, so fonts are left as
+    they are apart from deduplication.
+    """
+    try:
+        from pypdf import PdfWriter
+        from pypdf.generic import NameObject, StreamObject
+    except ImportError as exc:
+        raise RuntimeError("PDF optimization needs pypdf: pip install pypdf") from exc
+    if not hasattr(PdfWriter, "compress_identical_objects"):  # added in pypdf 5.0
+        raise RuntimeError("PDF optimization needs pypdf 5.0 or newer: pip install -U pypdf")
+
+    path = Path(path)
+    output = Path(output) if output else path
+    before = path.stat().st_size
+
+    writer = PdfWriter(clone_from=str(path))
+    seen_xobjects = set()
+    for page in writer.pages:
+        page.compress_content_streams(level=level)
+        resources = page.get("/Resources")
+        xobjects = resources.get_object().get("/XObject") if resources else None
+        if not xobjects:
+            continue
+        for ref in xobjects.get_object().values():
+            xobject = ref.get_object()
+            if id(xobject) in seen_xobjects:
+                continue
+            seen_xobjects.add(id(xobject))
+            if isinstance(xobject, StreamObject) and "/Filter" not in xobject:
+                xobject.set_data(zlib.compress(xobject.get_data(), level))
+                xobject[NameObject("/Filter")] = NameObject("/FlateDecode")
+    writer.compress_identical_objects()  # merge duplicates, drop unreferenced
+
+    # Write next to the target and swap in, so a failure never truncates it.
+    fd, tmp_name = tempfile.mkstemp(suffix=".pdf", dir=str(output.parent))
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            writer.write(handle)
+        # mkstemp creates the file 0600: keep the permissions of the original.
+        shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, output)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return before, output.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shrink a generated book PDF.")
+    parser.add_argument("pdf", type=Path, help="PDF to optimize")
+    parser.add_argument("--output", type=Path, help="Write here instead of in place")
+    parser.add_argument("--level", type=int, default=9, help="zlib level 1-9")
+    args = parser.parse_args()
+
+    before, after = optimize_pdf(args.pdf, args.output, args.level)
+    print(f"{args.pdf}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB "
+          f"({(after - before) * 100 / max(before, 1):+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
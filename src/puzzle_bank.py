@@ -3,11 +3,12 @@ from __future__ import annotations
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Import config to read puzzle_data setting
 sys.path.append(str(Path(__file__).parent.parent))
 from config.config_loader import Config
+from .compile_bank import compiled_themes, is_compiled
 
 # Base directory where this file lives
 BASE_DIR = Path(__file__).resolve().parent
@@ -25,11 +26,17 @@ _CANDIDATE_FILES = [
 ]
 
 PUZZLES: List[Dict[str, Any]] = []
+PUZZLE_FILE: Optional[Path] = None  # the file PUZZLES came from
 
 for path in _CANDIDATE_FILES:
     if path.exists():
-        PUZZLES = json.loads(path.read_text(encoding="utf-8"))
-        print(f"[puzzle_bank] Loaded {len(PUZZLES)} themes from {path.name}")
+        data = json.loads(path.read_text(encoding="utf-8"))
+        # A compiled bank (python -m src.compile_bank) carries normalized
+        # words, lengths and a fits-by-grid-size table per theme.
+        PUZZLES = compiled_themes(data, path.name) if is_compiled(data) else data
+        kind = "compiled " if is_compiled(data) else ""
+        print(f"[puzzle_bank] Loaded {len(PUZZLES)} {kind}themes from {path.name}")
+        PUZZLE_FILE = path
         break
 
 if not PUZZLES:
@@ -37,3 +44,11 @@ if not PUZZLES:
         "No puzzle bank JSON found. Expected one of: "
         + ", ".join(str(p) for p in _CANDIDATE_FILES)
     )
+
+
+def usable_words(entry: Dict[str, Any], size: int) -> List[str]:
+    """Words of a theme that fit a ``size`` x ``size`` grid."""
+    if "lengths" in entry:
+        # Compiled bank: lengths are precomputed.
+        return [w for w, length in zip(entry["words"], entry["lengths"]) if length <= size]
+    return [w for w in entry["words"] if len(w.replace(" ", "")) <= size]
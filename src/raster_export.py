@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from . import generate_book as book
+from .generate_book import CONFIG
+from .difficulty import BANDS
+from .page_model import Capsule, Grid, ImageRef, Page, Rect, RoundRect, TextRun
+from .word_search import FILL_MODES
+
+
+RASTER_FORMATS = ("png", "webp")
+
+
+def rgb(color: Sequence[float]) -> Tuple[int, int, int]:
+    return tuple(round(channel * 255) for channel in color[:3])
+
+
+@lru_cache(maxsize=256)
+def load_font(path: str, size_px: float) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(path, size_px)
+
+
+@lru_cache(maxsize=32)
+def load_art(path: str, mtime_ns: int, width: int, height: int) -> Image.Image:
+    with Image.open(path) as img:
+        return img.convert("RGBA").resize((width, height), Image.LANCZOS)
+
+
+class RasterCanvas:
+    """A page image addressed in PDF points (origin bottom-left, y up)."""
+
+    def __init__(self, width: float, height: float, dpi: float) -> None:
+        self.scale = dpi / 72.0
+        self.height = height
+        self.image = Image.new("RGB", (round(width * self.scale), round(height * self.scale)), "white")
+        self.draw = ImageDraw.Draw(self.image)
+        self.fonts = {
+            "display": str(book.find_font('display_font_path')),
+            "text": str(book.find_font('text_font_path')),
+        }
+
+    def point(self, x: float, y: float) -> Tuple[float, float]:
+        return x * self.scale, (self.height - y) * self.scale
+
+    def box(self, x: float, y: float, width: float, height: float) -> Tuple[float, float, float, float]:
+        left, top = self.point(x, y + height)
+        right, bottom = self.point(x + width, y)
+        return left, top, right, bottom
+
+    def rect(self, op: Rect) -> None:
+        self.draw.rectangle(self.box(op.x, op.y, op.width, op.height), fill=rgb(op.fill))
+
+    def round_rect(self, op: RoundRect) -> None:
+        self.draw.rounded_rectangle(
+            self.box(op.x, op.y, op.width, op.height),
+            radius=op.radius * self.scale,
+            fill=rgb(op.fill) if op.fill else None,
+            outline=rgb(op.stroke) if op.stroke else None,
+            width=max(1, round(op.line_width * self.scale)) if op.stroke else 0,
+            corners=(True, True, False, False) if op.top_only else None,
+        )
+
+    def text(self, op: TextRun) -> None:
+        font = load_font(self.fonts[op.font], op.size * self.scale)
+        anchor = "ms" if op.align == "center" else "ls"
+        self.draw.text(self.point(op.x, op.y), op.text, font=font, fill=rgb(op.color), anchor=anchor)
+
+    def image_at(self, op: ImageRef) -> None:
+        path = Path(op.path)
+        left, top, right, bottom = (round(v) for v in self.box(op.x, op.y, op.width, op.height))
+        art = load_art(str(path), path.stat().st_mtime_ns, max(right - left, 1), max(bottom - top, 1))
+        self.image.paste(art, (left, top), art)
+
+    def capsule(self, op: Capsule) -> None:
+        """Stadium spanning the op's ends, like ``draw_capsules``' PDF outline."""
+        fill = rgb(op.color)
+        x1, y1, x2, y2 = book.capsule_axis(op.x1, op.y1, op.x2, op.y2, op.thickness)
+        radius = op.thickness / 2 * self.scale
+        start, end = self.point(x1, y1), self.point(x2, y2)
+        for cx, cy in (start, end):
+            self.draw.ellipse((cx - radius, cy - radius, cx + radius, cy + radius), fill=fill)
+        if start != end:
+            self.draw.line([start, end], fill=fill, width=max(1, round(op.thickness * self.scale)))
+
+    def grid(self, op: Grid) -> None:
+        geometry = op.geometry
+        origin_x, origin_y, cell_size = geometry.origin_x, geometry.origin_y, geometry.cell_size
+        span = geometry.side
+        line_fill = rgb(op.line_color)
+        line_width = max(1, round(op.line_width * self.scale))
+        for i in range(geometry.grid_size + 1):
+            offset = i * cell_size
+            self.draw.line([self.point(origin_x, origin_y + offset), self.point(origin_x + span, origin_y + offset)],
+                           fill=line_fill, width=line_width)
+            self.draw.line([self.point(origin_x + offset, origin_y), self.point(origin_x + offset, origin_y + span)],
+                           fill=line_fill, width=line_width)
+
+        font = load_font(self.fonts["display"], op.letter_size * self.scale)
+        letter_fill = rgb(op.letter_color)
+        for y, row in enumerate(op.rows):
+            for x, letter in enumerate(row):
+                cx, cy = geometry.center(x, y)
+                self.draw.text(self.point(cx, cy - op.baseline_shift), letter, font=font,
+                               fill=letter_fill, anchor="ms")
+
+
+def render_page(page: Page, dpi: float = 150, image_format: str = "png") -> bytes:
+    """Rasterise one page model and return the encoded image."""
+    canvas = RasterCanvas(page.width, page.height, dpi)
+    for op in page.ops:
+        if isinstance(op, TextRun):
+            canvas.text(op)
+        elif isinstance(op, Rect):
+            canvas.rect(op)
+        elif isinstance(op, RoundRect):
+            canvas.round_rect(op)
+        elif isinstance(op, ImageRef):
+            canvas.image_at(op)
+        elif isinstance(op, Capsule):
+            canvas.capsule(op)
+        elif isinstance(op, Grid):
+            canvas.grid(op)
+        else:
+            raise TypeError(f"Unknown page op: {op!r}")
+
+    buffer = BytesIO()
+    options = {"compress_level": 6} if image_format == "png" else {"quality": 85, "method": 4}
+    canvas.image.save(buffer, format=image_format.upper(), dpi=(dpi, dpi), **options)
+    return buffer.getvalue()
+
+
+def iter_rendered_pages(
+    pages: Iterable[Page],
+    dpi: float = 150,
+    image_format: str = "png",
+    workers: int = 1,
+) -> Iterator[Tuple[Page, bytes]]:
+    """Yield ``(page, encoded image)`` in page order, rendering across ``workers`` processes.
+
+    Only a few pages per worker are in flight at a time, so a lazily laid out
+    book is never held in memory as a whole.
+    """
+    if workers <= 1:
+        for page in pages:
+            yield page, render_page(page, dpi, image_format)
+        return
+
+    book.ensure_fonts()  # register before forking so workers inherit it
+    window = workers * 4
+    pending: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for page in pages:
+            pending.append((page, pool.submit(render_page, page, dpi, image_format)))
+            if len(pending) >= window:
+                done_page, future = pending.popleft()
+                yield done_page, future.result()
+        while pending:
+            done_page, future = pending.popleft()
+            yield done_page, future.result()
+
+
+def page_file_name(page: Page, image_format: str) -> str:
+    return f"page-{page.page_num:04d}-{page.kind}.{image_format}"
+
+
+def export_pages(
+    pages: Iterable[Page],
+    target: Path | BinaryIO,
+    dpi: float = 150,
+    image_format: str = "png",
+    workers: int = 1,
+) -> int:
+    """Write page images to a directory, a ``.zip`` path or a binary stream (as zip).
+
+    Returns the number of pages written. Pages are written as they finish.
+    """
+    if image_format not in RASTER_FORMATS:
+        raise ValueError(f"Unknown image format: {image_format!r} (expected one of {RASTER_FORMATS})")
+    rendered = iter_rendered_pages(pages, dpi, image_format, workers)
+
+    written = 0
+    if isinstance(target, Path) and target.suffix.lower() != ".zip":
+        target.mkdir(parents=True, exist_ok=True)
+        for page, data in rendered:
+            (target / page_file_name(page, image_format)).write_bytes(data)
+            written += 1
+        return written
+
+    if isinstance(target, Path):
+        target.parent.mkdir(parents=True, exist_ok=True)
+    # Images are already compressed, so the archive just stores them.
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED) as archive:
+        for page, data in rendered:
+            archive.writestr(page_file_name(page, image_format), data)
+            written += 1
+    return written
+
+
+def parse_page_ranges(text: str) -> set[int]:
+    """``"1-4,9"`` -> ``{1, 2, 3, 4, 9}``."""
+    pages: set[int] = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        pages.update(range(int(first), int(last or first) + 1))
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render book pages straight to PNG/WebP images.")
+    parser.add_argument("--output", type=Path, required=True, help="Directory, or a .zip file")
+    parser.add_argument("--count", type=int, default=CONFIG.get('puzzle_generation', 'count'), help="Number of puzzles")
+    parser.add_argument("--size", type=int, default=CONFIG.get('puzzle_generation', 'grid_size'), help="Grid size (NxN)")
+    parser.add_argument("--seed", type=int, default=CONFIG.get('puzzle_generation', 'seed'), help="Random seed")
+    parser.add_argument("--dpi", type=float, default=150, help="Output resolution")
+    parser.add_argument("--format", choices=RASTER_FORMATS, default="png", help="Image format")
+    parser.add_argument("--pages", help="Only these pages, e.g. 1-4,9")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--compact-solutions", action="store_true", default=None,
+                        help="Tile several solutions per page")
+    parser.add_argument("--fill-mode", choices=FILL_MODES, help="Filler letters: random or constrained")
+    parser.add_argument("--difficulty", choices=tuple(BANDS), help="Target difficulty band for every puzzle")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    book.ensure_fonts()
+    pages = book.iter_book_pages(args.count, args.size, args.seed, args.fill_mode, args.difficulty,
+                                 compact_solutions=args.compact_solutions)
+    if args.pages:
+        wanted = parse_page_ranges(args.pages)
+        pages = (page for page in pages if page.page_num in wanted)
+
+    written = export_pages(pages, args.output, args.dpi, args.format, args.workers)
+    print(f"[raster_export] Wrote {written} {args.format.upper()} pages at {args.dpi:g} dpi "
+          f"to {args.output} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
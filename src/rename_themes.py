@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import re
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
 
 
 DATA_PATH = Path(__file__).with_name("puzzle_bank_data.json")
@@ -22,18 +22,14 @@ def normalize_theme(theme: str) -> str:
     return stripped
 
 
-def main() -> None:
-    if not DATA_PATH.exists():
-        raise FileNotFoundError(f"Missing data file: {DATA_PATH}")
-
-    data: List[Dict] = json.loads(DATA_PATH.read_text(encoding="utf-8"))
-
-    # Backup original once, if not already there.
-    if not BACKUP_PATH.exists():
-        BACKUP_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+def rename_themes(entries: Iterable[Dict]) -> Iterator[Dict]:
+    """Normalize each entry's theme in place and yield it.
 
+    Repeated labels get a small letter suffix (no numbers), e.g.
+    "Winter Weather (B)", "Winter Weather (C)".
+    """
     seen: Dict[str, int] = {}
-    for entry in data:
+    for entry in entries:
         old_theme = entry.get("theme", "")
         base = normalize_theme(old_theme)
 
@@ -43,11 +39,24 @@ def main() -> None:
         if count == 0:
             new_theme = base
         else:
-            # e.g. "Winter Weather (B)", "Winter Weather (C)", etc.
             suffix = chr(ord("A") + count)
             new_theme = f"{base} ({suffix})"
 
         entry["theme"] = new_theme
+        yield entry
+
+
+def main() -> None:
+    if not DATA_PATH.exists():
+        raise FileNotFoundError(f"Missing data file: {DATA_PATH}")
+
+    data: List[Dict] = json.loads(DATA_PATH.read_text(encoding="utf-8"))
+
+    # Backup original once, if not already there.
+    if not BACKUP_PATH.exists():
+        BACKUP_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    data = list(rename_themes(data))
 
     DATA_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
     print(f"Updated {len(data)} themes in {DATA_PATH}")
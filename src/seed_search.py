@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .puzzle_bank import PUZZLE_FILE, PUZZLES, config as CONFIG, usable_words
+from .word_search import ENGINE_VERSION, FILL_MODES, LETTER_PROFILES, PLACEMENT_MODES, WordSearchPuzzle
+
+
+# Seed tables live next to their bank: puzzle_bank_custom.json ->
+# puzzle_bank_custom.seeds.json. Each table is keyed by grid size, placement
+# mode, base seed and filler settings (constrained filler can fail), and each
+# row by the theme's position in the bank, with a digest of its words so an
+# edited theme is searched again.
+
+
+def seed_table_path(bank: Path) -> Path:
+    return Path(bank).with_name(f"{Path(bank).stem}.seeds.json")
+
+
+def table_key(
+    size: int,
+    placement: str,
+    base_seed: int,
+    fill_mode: str = "random",
+    letter_profile: str = "uniform",
+    banned_words: Sequence[str] = (),
+) -> str:
+    banned = words_digest(sorted(word.upper().replace(" ", "") for word in banned_words))[:8] if banned_words else "-"
+    return f"{size}/{placement}/{base_seed}/{fill_mode}/{letter_profile}/{banned}"
+
+
+def words_digest(words: Sequence[str]) -> str:
+    return hashlib.sha1("\n".join(words).encode("utf-8")).hexdigest()[:16]
+
+
+def read_seed_file(path: Path) -> dict:
+    """The whole seed file, or an empty one when missing or from another engine version."""
+    if not path.exists():
+        return {"engine": ENGINE_VERSION, "tables": {}}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("engine") != ENGINE_VERSION:
+        print(f"[seed_search] {path.name} is from engine {data.get('engine')}, "
+              f"current is {ENGINE_VERSION}: ignoring it")
+        return {"engine": ENGINE_VERSION, "tables": {}}
+    return data
+
+
+def load_seed_table(
+    bank: Optional[Path],
+    size: int,
+    placement: str,
+    base_seed: int,
+    themes: Sequence[Tuple[int, Sequence[str]]] = (),
+    fill_mode: str = "random",
+    letter_profile: str = "uniform",
+    banned_words: Sequence[str] = (),
+) -> Dict[int, Optional[int]]:
+    """``{bank position: seed}`` for the rows whose words still match ``themes``.
+
+    ``themes`` is ``(position, usable words)`` pairs; rows for themes that
+    changed since the search are left out. ``None`` marks a theme for which
+    no seed was found, so builds can skip it without trying.
+    """
+    if bank is None:
+        return {}
+    key = table_key(size, placement, base_seed, fill_mode, letter_profile, banned_words)
+    table = read_seed_file(seed_table_path(bank))["tables"].get(key, {})
+    digests = {position: words_digest(words) for position, words in themes}
+    seeds = {}
+    for position, row in table.items():
+        position = int(position)
+        if digests.get(position) == row["digest"]:
+            seeds[position] = row["seed"]
+    return seeds
+
+
+def first_working_seed(
+    words: Sequence[str],
+    size: int,
+    start: int,
+    max_tries: int,
+    placement: str = "length",
+    theme: str = "",
+    fill_mode: str = "random",
+    letter_profile: str = "uniform",
+    banned_words: Sequence[str] = (),
+) -> Tuple[Optional[int], int]:
+    """Try ``start``, ``start + 1``, ... until a whole puzzle generates.
+
+    Returns ``(seed or None, tries)``. The filler runs too, with the build's
+    settings: constrained filler fails when it cannot avoid a banned word.
+    """
+    for tries in range(1, max_tries + 1):
+        puzzle = WordSearchPuzzle(
+            size=size,
+            words=list(words),
+            seed=start + tries - 1,
+            placement=placement,
+            theme=theme,
+            fill_mode=fill_mode,
+            letter_weights=LETTER_PROFILES[letter_profile],
+            banned_words=banned_words,
+        )
+        try:
+            puzzle.generate()
+        except RuntimeError:
+            continue
+        return start + tries - 1, tries
+    return None, max_tries
+
+
+def _search_one(job: Tuple[int, str, List[str], int, int, int, str, int, tuple]) -> Tuple[int, Optional[int], int]:
+    position, theme, words, size, start, max_tries, placement, done, fill = job
+    seed, tries = first_working_seed(words, size, start, max_tries, placement, theme, *fill)
+    return position, seed, done + tries
+
+
+def search_seeds(
+    bank: Path,
+    entries: Sequence[dict],
+    size: int,
+    base_seed: int,
+    placement: str = "length",
+    min_words: int = 1,
+    max_tries: int = 200,
+    workers: int = 1,
+    fill_mode: str = "random",
+    letter_profile: str = "uniform",
+    banned_words: Sequence[str] = (),
+) -> dict:
+    """Find a first-try seed for every theme of ``entries`` and persist the table.
+
+    Each try generates the whole puzzle with the given filler settings, which
+    are part of the table key.
+
+    Themes already in the table with unchanged words are skipped, unless
+    they were unsolved within fewer than ``max_tries`` seeds. Each search
+    starts at the seed a plain build would use (``base_seed + position + 1``),
+    so themes that already worked keep their puzzle.
+    """
+    started = time.perf_counter()
+    path = seed_table_path(bank)
+    data = read_seed_file(path)
+    fill = (fill_mode, letter_profile, tuple(banned_words))
+    key = table_key(size, placement, base_seed, *fill)
+    table = data["tables"].setdefault(key, {})
+
+    jobs = []
+    for position, entry in enumerate(entries):
+        words = usable_words(entry, size)
+        if len(words) < min_words:
+            continue
+        start, done = base_seed + position + 1, 0
+        row = table.get(str(position))
+        if row and row["digest"] == words_digest(words):
+            if row["seed"] is not None or row["tries"] >= max_tries:
+                continue
+            done = row["tries"]  # unsolved with fewer tries: carry on after them
+        jobs.append((position, entry["theme"], words, size, start + done, max_tries - done, placement, done, fill))
+
+    summary = {"themes": len(jobs), "first_try": 0, "found": 0, "unsolved": 0, "tries": 0}
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_search_one, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        results = [_search_one(job) for job in jobs]
+
+    for (position, _, words, *_, done, _), (_, seed, tries) in zip(jobs, results):
+        table[str(position)] = {
+            "theme": entries[position]["theme"],
+            "digest": words_digest(words),
+            "seed": seed,
+            "tries": tries,
+        }
+        summary["tries"] += tries - done
+        if seed is None:
+            summary["unsolved"] += 1
+        else:
+            summary["found"] += 1
+            summary["first_try"] += tries == 1
+
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    summary["path"] = str(path)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Find a seed per theme that places every word on the first try.")
+    parser.add_argument("--size", type=int, default=CONFIG.get('puzzle_generation', 'grid_size'), help="Grid size (NxN)")
+    parser.add_argument("--seed", type=int, default=CONFIG.get('puzzle_generation', 'seed'),
+                        help="Base seed of the builds that will use the table")
+    parser.add_argument("--max-tries", type=int, default=200, help="Seeds to try per theme")
+    parser.add_argument("--fill-mode", choices=FILL_MODES,
+                        help="Filler of the builds that will use the table (default: puzzle_generation.fill_mode)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    args = parser.parse_args()
+
+    placement = CONFIG.get('puzzle_generation', 'placement') or "length"
+    if placement not in PLACEMENT_MODES:
+        raise ValueError(f"Unknown placement: {placement!r}")
+    fill_mode = args.fill_mode or CONFIG.get('puzzle_generation', 'fill_mode') or "random"
+    summary = search_seeds(
+        PUZZLE_FILE,
+        PUZZLES,
+        args.size,
+        args.seed,
+        placement,
+        min_words=CONFIG.get('puzzle_generation', 'min_words_per_puzzle') or 1,
+        max_tries=args.max_tries,
+        workers=args.workers,
+        fill_mode=fill_mode,
+        letter_profile=CONFIG.get('puzzle_generation', 'letter_profile') or "uniform",
+        banned_words=CONFIG.get('puzzle_generation', 'banned_words') or [],
+    )
+    print(f"[seed_search] {summary['themes']} themes searched in {summary['seconds']:.2f}s: "
+          f"{summary['first_try']} worked with their default seed, "
+          f"{summary['found'] - summary['first_try']} needed another, {summary['unsolved']} unsolved "
+          f"({summary['tries']} generations) -> {summary['path']}")
+
+
+if __name__ == "__main__":
+    main()
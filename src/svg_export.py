@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+from xml.sax.saxutils import escape
+
+from . import generate_book as book
+from .generate_book import CONFIG
+from .difficulty import BANDS
+from .page_model import Capsule, Grid, ImageRef, Page, Rect, RoundRect, TextRun
+from .word_search import FILL_MODES, PuzzleResult
+
+
+DEFAULT_CELL = 32.0
+DEFAULT_FONT_FAMILY = "Biski, 'Helvetica Neue', Arial, sans-serif"
+
+
+def svg_color(color) -> str:
+    return "#%02x%02x%02x" % tuple(round(channel * 255) for channel in color[:3])
+
+
+def fmt(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def page_svg(page: Page, font_family: str = DEFAULT_FONT_FAMILY) -> str:
+    """Standalone SVG of a page model (y flipped: page models are y-up)."""
+    height = page.height
+    family = escape(font_family, {'"': "&quot;"})
+    # Leave room for the outer half of the widest grid line.
+    pad = max([op.line_width for op in page.ops if isinstance(op, Grid)] + [0.0])
+    width_attr, height_attr = fmt(page.width + 2 * pad), fmt(page.height + 2 * pad)
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{fmt(-pad)} {fmt(-pad)} '
+             f'{width_attr} {height_attr}" width="{width_attr}" height="{height_attr}">']
+
+    capsules: List[Capsule] = []
+
+    def flush_capsules() -> None:
+        # Consecutive capsules share one group (they share colour and width).
+        if not capsules:
+            return
+        first = capsules[0]
+        parts.append(f'<g class="solution" stroke="{svg_color(first.color)}" '
+                     f'stroke-width="{fmt(first.thickness)}" stroke-linecap="round">')
+        for op in capsules:
+            x1, y1, x2, y2 = book.capsule_axis(op.x1, op.y1, op.x2, op.y2, op.thickness)
+            parts.append(f'<line data-word="{escape(op.word)}" x1="{fmt(x1)}" y1="{fmt(height - y1)}" '
+                         f'x2="{fmt(x2)}" y2="{fmt(height - y2)}"/>')
+        parts.append('</g>')
+        capsules.clear()
+
+    for op in page.ops:
+        if isinstance(op, Capsule):
+            if capsules and (op.color, op.thickness) != (capsules[0].color, capsules[0].thickness):
+                flush_capsules()
+            capsules.append(op)
+            continue
+        flush_capsules()
+        if isinstance(op, Rect):
+            parts.append(f'<rect x="{fmt(op.x)}" y="{fmt(height - op.y - op.height)}" width="{fmt(op.width)}" '
+                         f'height="{fmt(op.height)}" fill="{svg_color(op.fill)}"/>')
+        elif isinstance(op, RoundRect):
+            paint = (f'fill="{svg_color(op.fill) if op.fill else "none"}"'
+                     + (f' stroke="{svg_color(op.stroke)}" stroke-width="{fmt(op.line_width)}"' if op.stroke else ""))
+            top = height - op.y - op.height
+            if op.top_only:
+                r = op.radius
+                parts.append(f'<path d="M{fmt(op.x)} {fmt(top + op.height)}V{fmt(top + r)}'
+                             f'A{fmt(r)} {fmt(r)} 0 0 1 {fmt(op.x + r)} {fmt(top)}H{fmt(op.x + op.width - r)}'
+                             f'A{fmt(r)} {fmt(r)} 0 0 1 {fmt(op.x + op.width)} {fmt(top + r)}'
+                             f'V{fmt(top + op.height)}Z" {paint}/>')
+            else:
+                parts.append(f'<rect x="{fmt(op.x)}" y="{fmt(top)}" width="{fmt(op.width)}" '
+                             f'height="{fmt(op.height)}" rx="{fmt(op.radius)}" {paint}/>')
+        elif isinstance(op, TextRun):
+            anchor = ' text-anchor="middle"' if op.align == "center" else ""
+            parts.append(f'<text x="{fmt(op.x)}" y="{fmt(height - op.y)}" font-family="{family}" '
+                         f'font-size="{fmt(op.size)}" fill="{svg_color(op.color)}"{anchor}>{escape(op.text)}</text>')
+        elif isinstance(op, ImageRef):
+            parts.append(f'<image href="{escape(Path(op.path).as_posix())}" x="{fmt(op.x)}" '
+                         f'y="{fmt(height - op.y - op.height)}" width="{fmt(op.width)}" height="{fmt(op.height)}"/>')
+        elif isinstance(op, Grid):
+            parts.append(grid_svg(op, height, family))
+        else:
+            raise TypeError(f"Unknown page op: {op!r}")
+    flush_capsules()
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+
+def grid_svg(op: Grid, height: float, family: str) -> str:
+    geometry = op.geometry
+    left, bottom, side = geometry.origin_x, geometry.origin_y, geometry.side
+    top = height - bottom - side
+    path = []
+    for i in range(geometry.grid_size + 1):
+        offset = i * geometry.cell_size
+        path.append(f"M{fmt(left)} {fmt(top + offset)}H{fmt(left + side)}"
+                    f"M{fmt(left + offset)} {fmt(top)}V{fmt(top + side)}")
+    parts = [f'<path class="grid" d="{"".join(path)}" fill="none" '
+             f'stroke="{svg_color(op.line_color)}" stroke-width="{fmt(op.line_width)}"/>',
+             f'<g class="letters" font-family="{family}" font-size="{fmt(op.letter_size)}" '
+             f'text-anchor="middle" fill="{svg_color(op.letter_color)}">']
+    xs = [fmt(x) for x in geometry.col_centers]
+    # One element per cell so front ends can hit-test and highlight letters.
+    for row_idx, row in enumerate(op.rows):
+        y = fmt(height - (geometry.row_centers[row_idx] - op.baseline_shift))
+        parts.append("".join(f'<text x="{xs[col]}" y="{y}">{escape(letter)}</text>'
+                             for col, letter in enumerate(row)))
+    parts.append('</g>')
+    return "\n".join(parts)
+
+
+def puzzle_svg(
+    puzzle: PuzzleResult,
+    solution: bool = False,
+    cell_size: float = DEFAULT_CELL,
+    font_family: str = DEFAULT_FONT_FAMILY,
+) -> str:
+    """Standalone SVG of one grid, optionally with its solution capsules.
+
+    Built from ``layout_grid_figure``, so colours, proportions and capsule
+    spans match the book pages.
+    """
+    return page_svg(book.layout_grid_figure(puzzle, solution, cell_size), font_family)
+
+
+def puzzle_sidecar(data: dict, puzzle: PuzzleResult) -> Dict[str, object]:
+    """JSON-ready description of a puzzle for interactive front ends."""
+    return {
+        "theme": data.get("theme", ""),
+        "position": data.get("position"),
+        "source_index": data.get("source_index"),
+        "size": puzzle.size,
+        "seed": puzzle.seed,
+        "grid": puzzle.as_rows(),
+        "words": list(data.get("words", puzzle.words)),
+        "placements": [
+            {
+                "word": placed.word,
+                "start": [placed.x, placed.y],
+                "end": list(placed.end),
+                "direction": [placed.dx, placed.dy],
+            }
+            for placed in puzzle.placements
+        ],
+    }
+
+
+def export_puzzles(
+    puzzles: Iterable[Tuple[dict, PuzzleResult]],
+    output_dir: Path,
+    solutions: bool = True,
+    cell_size: float = DEFAULT_CELL,
+    font_family: str = DEFAULT_FONT_FAMILY,
+) -> int:
+    """Stream puzzles to ``output_dir`` as SVG + JSON files, one puzzle at a time.
+
+    Nothing is accumulated: each puzzle is written and dropped before the next
+    is generated, and ``index.jsonl`` gets one line per puzzle as it goes.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(output_dir / "index.jsonl", "w", encoding="utf-8") as index:
+        for idx, (data, puzzle) in enumerate(puzzles, start=1):
+            stem = f"puzzle-{idx:05d}"
+            files = {"puzzle": f"{stem}.svg", "data": f"{stem}.json"}
+            (output_dir / files["puzzle"]).write_text(
+                puzzle_svg(puzzle, False, cell_size, font_family), encoding="utf-8")
+            if solutions:
+                files["solution"] = f"{stem}-solution.svg"
+                (output_dir / files["solution"]).write_text(
+                    puzzle_svg(puzzle, True, cell_size, font_family), encoding="utf-8")
+            (output_dir / files["data"]).write_text(
+                json.dumps(puzzle_sidecar(data, puzzle), separators=(",", ":")), encoding="utf-8")
+            index.write(json.dumps({"index": idx, "theme": data.get("theme", ""), **files}) + "\n")
+            written += 1
+            if written % 500 == 0:
+                print(f"  Exported {written} puzzles...")
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export puzzles as standalone SVG files with JSON sidecars.")
+    parser.add_argument("--output", type=Path, required=True, help="Output directory")
+    parser.add_argument("--count", type=int, default=CONFIG.get('puzzle_generation', 'count'), help="Number of puzzles")
+    parser.add_argument("--size", type=int, default=CONFIG.get('puzzle_generation', 'grid_size'), help="Grid size (NxN)")
+    parser.add_argument("--seed", type=int, default=CONFIG.get('puzzle_generation', 'seed'), help="Random seed")
+    parser.add_argument("--fill-mode", choices=FILL_MODES, help="Filler letters: random or constrained")
+    parser.add_argument("--difficulty", choices=tuple(BANDS), help="Target difficulty band for every puzzle")
+    parser.add_argument("--cell", type=float, default=DEFAULT_CELL, help="Cell size in SVG units")
+    parser.add_argument("--font-family", default=DEFAULT_FONT_FAMILY, help="CSS font-family for the letters")
+    parser.add_argument("--no-solutions", action="store_true", help="Skip the solution SVGs")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    puzzles = book.iter_puzzles(args.count, args.size, args.seed, args.fill_mode, args.difficulty)
+    written = export_puzzles(puzzles, args.output, not args.no_solutions, args.cell, args.font_family)
+    print(f"[svg_export] Wrote {written} puzzles to {args.output} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
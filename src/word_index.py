@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .dedup import exact_key, iter_bank
+
+
+# Bump when the tables change; older index files are rebuilt from scratch.
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS banks (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS themes (
+    id INTEGER PRIMARY KEY,
+    bank TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    theme TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    word_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS themes_bank ON themes (bank, theme);
+CREATE TABLE IF NOT EXISTS words (
+    theme_id INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (theme_id, word)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS words_word ON words (word);
+"""
+
+
+def file_digest(path: Path) -> str:
+    sha = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def theme_digest(entry: dict) -> str:
+    return hashlib.sha1(json.dumps(entry["words"], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IndexUpdate:
+    themes: int = 0     # themes in the bank
+    changed: int = 0    # themes (re)indexed
+    removed: int = 0    # themes dropped from the index
+    seconds: float = 0.0
+    unchanged_file: bool = False
+
+
+class WordIndex:
+    """Persistent normalized word -> themes index over one or more bank files.
+
+    Each theme is stored with a digest of its word list and each bank with
+    its size, mtime and content digest, so ``update`` re-reads nothing for an
+    untouched file and re-indexes only the themes whose words changed.
+    Totals and duplicates are then plain SQL queries.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS banks; DROP TABLE IF EXISTS themes; "
+                                  "DROP TABLE IF EXISTS words;")
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "WordIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def bank_key(bank: Path) -> str:
+        return str(Path(bank).resolve())
+
+    def update(self, bank: Path) -> IndexUpdate:
+        """Bring the index up to date with ``bank``."""
+        started = time.perf_counter()
+        key = self.bank_key(bank)
+        stat = Path(bank).stat()
+        report = IndexUpdate()
+
+        row = self.db.execute("SELECT mtime_ns, size, digest FROM banks WHERE path = ?", (key,)).fetchone()
+        if row and (row[0], row[1]) == (stat.st_mtime_ns, stat.st_size):
+            report.unchanged_file = True
+        else:
+            digest = file_digest(Path(bank))
+            if row and row[2] == digest:
+                report.unchanged_file = True
+            else:
+                self._reindex(key, Path(bank), report)
+            self.db.execute("INSERT OR REPLACE INTO banks VALUES (?, ?, ?, ?)",
+                            (key, stat.st_mtime_ns, stat.st_size, digest))
+            self.db.commit()
+
+        if report.unchanged_file:
+            report.themes = self.db.execute("SELECT COUNT(*) FROM themes WHERE bank = ?", (key,)).fetchone()[0]
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _reindex(self, key: str, bank: Path, report: IndexUpdate) -> None:
+        # Stored themes by (name, digest); several rows when a theme repeats.
+        stored: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for theme_id, theme, digest in self.db.execute(
+            "SELECT id, theme, digest FROM themes WHERE bank = ? ORDER BY position", (key,)
+        ):
+            stored[(theme, digest)].append(theme_id)
+
+        for position, entry in enumerate(iter_bank(bank)):
+            report.themes += 1
+            digest = theme_digest(entry)
+            ids = stored.get((entry["theme"], digest))
+            if ids:
+                self.db.execute("UPDATE themes SET position = ? WHERE id = ?", (position, ids.pop(0)))
+                continue
+            report.changed += 1
+            cursor = self.db.execute(
+                "INSERT INTO themes (bank, position, theme, digest, word_count) VALUES (?, ?, ?, ?, ?)",
+                (key, position, entry["theme"], digest, len(entry["words"])),
+            )
+            counts = Counter(exact_key(word) for word in entry["words"])
+            self.db.executemany("INSERT INTO words VALUES (?, ?, ?)",
+                                ((cursor.lastrowid, word, count) for word, count in counts.items()))
+
+        stale = [(theme_id,) for ids in stored.values() for theme_id in ids]
+        report.removed = len(stale)
+        self.db.executemany("DELETE FROM words WHERE theme_id = ?", stale)
+        self.db.executemany("DELETE FROM themes WHERE id = ?", stale)
+
+    def stats(self, bank: Path) -> dict:
+        """Same shape as ``analyze_words.analyze``: counts plus the duplicate list."""
+        key = self.bank_key(bank)
+        theme_count, total_words = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(word_count), 0) FROM themes WHERE bank = ?", (key,)
+        ).fetchone()
+        unique_words = self.db.execute(
+            "SELECT COUNT(DISTINCT word) FROM words JOIN themes ON themes.id = words.theme_id "
+            "WHERE themes.bank = ?", (key,)
+        ).fetchone()[0]
+        duplicates = self.db.execute(
+            "SELECT word, SUM(count) AS total FROM words JOIN themes ON themes.id = words.theme_id "
+            "WHERE themes.bank = ? GROUP BY word HAVING total > 1 ORDER BY total DESC, word", (key,)
+        ).fetchall()
+        return {
+            "theme_count": theme_count,
+            "total_words": total_words,
+            "unique_words": unique_words,
+            "duplicates": [(word, count) for word, count in duplicates],
+        }
+
+    def themes_for(self, bank: Path, word: str) -> List[str]:
+        """Themes that use ``word`` (normalized), in bank order."""
+        rows = self.db.execute(
+            "SELECT theme FROM words JOIN themes ON themes.id = words.theme_id "
+            "WHERE themes.bank = ? AND words.word = ? ORDER BY themes.position",
+            (self.bank_key(bank), exact_key(word)),
+        )
+        return [theme for (theme,) in rows]
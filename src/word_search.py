@@ -1,13 +1,27 @@
 from __future__ import annotations
 
 
+import hashlib
 import random
 import string
+import struct
+import time
+from array import array
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Set
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Set
+
+from .automaton import WordAutomaton
 
 
 Direction = Tuple[int, int]
+# Lines tried for one word before placement starts keeping a free-run index.
+FREE_INDEX_AFTER = 64
+
+# Start cell and direction of a word: (x, y, dx, dy).
+Line = Tuple[int, int, int, int]
 
 
 DIRECTIONS: Tuple[Direction, ...] = (
@@ -22,12 +36,288 @@ DIRECTIONS: Tuple[Direction, ...] = (
 )
 
 
+# Directions that read left-to-right or top-to-bottom (no backwards words).
+FORWARD_DIRECTIONS: Tuple[Direction, ...] = (
+    (0, 1),    # down
+    (1, 0),    # right
+    (1, 1),    # down-right
+    (1, -1),   # up-right
+)
+
+
+# Only across and down, the classic beginner layout.
+STRAIGHT_DIRECTIONS: Tuple[Direction, ...] = (
+    (0, 1),    # down
+    (1, 0),    # right
+)
+
+
+# Everything except plain across and down.
+HARD_DIRECTIONS: Tuple[Direction, ...] = (
+    (0, -1),   # up
+    (-1, 0),   # left
+    (1, 1),    # down-right
+    (-1, -1),  # up-left
+    (1, -1),   # up-right
+    (-1, 1),   # down-left
+)
+
+
+# One direction per line orientation, chosen so that the previous cell on the
+# line always comes earlier in row-major order. Reversed words cover the rest.
+SCAN_DIRECTIONS: Tuple[Direction, ...] = (
+    (1, 0),    # right
+    (0, 1),    # down
+    (1, 1),    # down-right
+    (-1, 1),   # down-left
+)
+
+
+FILL_MODES = ("random", "constrained")
+
+
+# Bump whenever a change makes the same seed produce a different grid, so
+# persisted seed tables (seed_search.py) are searched again.
+ENGINE_VERSION = 3
+
+
+# "length": longest words first, first free spot wins.
+# "crossing": order by length plus crossing potential with words already
+# placed, and pick the spot that overlaps the most placed letters among the
+# first CROSSING_CANDIDATES free spots found.
+PLACEMENT_MODES = ("length", "crossing")
+CROSSING_CANDIDATES = 16
+
+
+# Relative letter frequencies of English text (percent), for natural filler.
+ENGLISH_LETTER_FREQUENCIES: Dict[str, float] = {
+    "A": 8.2, "B": 1.5, "C": 2.8, "D": 4.3, "E": 12.7, "F": 2.2, "G": 2.0,
+    "H": 6.1, "I": 7.0, "J": 0.15, "K": 0.77, "L": 4.0, "M": 2.4, "N": 6.7,
+    "O": 7.5, "P": 1.9, "Q": 0.095, "R": 6.0, "S": 6.3, "T": 9.1, "U": 2.8,
+    "V": 0.98, "W": 2.4, "X": 0.15, "Y": 2.0, "Z": 0.074,
+}
+
+
+LETTER_PROFILES: Dict[str, Optional[Dict[str, float]]] = {
+    "uniform": None,
+    "english": ENGLISH_LETTER_FREQUENCIES,
+}
+
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised mid-placement when a generation budget runs out."""
+
+
+class FillFailed(RuntimeError):
+    """Raised when constrained filler cannot avoid spelling a forbidden word."""
+
 
 @dataclass
+class Budget:
+    """Operation and/or wall-clock allowance for generation.
+
+    One operation is one path preview (a word tried at one start and
+    direction). A budget with a ``parent`` (e.g. a puzzle within a book)
+    spends from both, so whichever runs out first stops placement.
+    """
+    max_ops: Optional[int] = None
+    deadline: Optional[float] = None  # time.monotonic() value
+    parent: Optional["Budget"] = None
+    ops: int = 0
+
+
+    @classmethod
+    def start(
+        cls,
+        seconds: Optional[float] = None,
+        max_ops: Optional[int] = None,
+        parent: Optional["Budget"] = None,
+    ) -> Optional["Budget"]:
+        """A budget running from now, or ``parent`` alone when no limit is set."""
+        if seconds is None and max_ops is None:
+            return parent
+        deadline = time.monotonic() + seconds if seconds is not None else None
+        return cls(max_ops=max_ops, deadline=deadline, parent=parent)
+
+
+    def spend(self, ops: int = 1) -> None:
+        self.ops += ops
+        if self.max_ops is not None and self.ops > self.max_ops:
+            raise BudgetExceeded(f"operation budget of {self.max_ops} spent")
+        # The clock is only read every 256 operations.
+        if self.deadline is not None and self.ops & 255 == 0 and time.monotonic() > self.deadline:
+            raise BudgetExceeded("time budget spent")
+        if self.parent is not None:
+            self.parent.spend(ops)
+
+
+    @property
+    def exhausted(self) -> bool:
+        if self.max_ops is not None and self.ops >= self.max_ops:
+            return True
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            return True
+        return self.parent is not None and self.parent.exhausted
+
+
+@lru_cache(maxsize=None)
+def valid_lines(size: int, length: int, directions: Tuple[Direction, ...]) -> Tuple[Line, ...]:
+    """Every line of ``length`` cells in ``directions`` that stays inside the grid."""
+    end = length - 1
+    return tuple(
+        (x, y, dx, dy)
+        for dx, dy in directions
+        for y in range(size)
+        for x in range(size)
+        if 0 <= x + dx * end < size and 0 <= y + dy * end < size
+    )
+
+
+DIRECTION_INDEX: Dict[Direction, int] = {direction: i for i, direction in enumerate(DIRECTIONS)}
+
+
+def draw_lines(lines: Sequence[Line], rng: random.Random) -> Iterator[Line]:
+    """``lines`` in uniform random order, drawn one at a time (partial Fisher-Yates).
+
+    No line comes up twice and only the lines actually tried cost a draw,
+    instead of shuffling every start cell up front.
+    """
+    pool = list(lines)
+    for n in range(len(pool), 0, -1):
+        i = rng.randrange(n)
+        pool[i], pool[n - 1] = pool[n - 1], pool[i]
+        yield pool[n - 1]
+
+
+def derive_rng(seed: int, *key: object) -> random.Random:
+    """Independent generator for one stream of a puzzle.
+
+    The stream seed is a hash of ``seed`` and ``key`` (e.g. theme, phase and
+    word index), so a stream never depends on how much any other stream drew.
+    """
+    material = "\x1f".join(str(part) for part in (seed, *key)).encode("utf-8")
+    return random.Random(int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), "little"))
+
+
+def direction_family(dx: int, dy: int) -> str:
+    if dy == 0 and dx != 0:
+        return "H"  # horizontal
+    if dx == 0 and dy != 0:
+        return "V"  # vertical
+    if dx != 0 and dy != 0:
+        return "D"  # diagonal
+    return "H"
+
+
+
+@dataclass(frozen=True, slots=True)
 class PlacedWord:
+    """A hidden word stored as start cell + direction; the path is derived."""
     word: str
-    path: List[Tuple[int, int]]
-    direction_family: str  # "H", "V", or "D"
+    x: int
+    y: int
+    dx: int
+    dy: int
+
+
+    @property
+    def length(self) -> int:
+        return len(self.word)
+
+
+    @property
+    def path(self) -> List[Tuple[int, int]]:
+        return [(self.x + i * self.dx, self.y + i * self.dy) for i in range(len(self.word))]
+
+
+    @property
+    def end(self) -> Tuple[int, int]:
+        last = len(self.word) - 1
+        return self.x + last * self.dx, self.y + last * self.dy
+
+
+    @property
+    def direction_family(self) -> str:  # "H", "V", or "D"
+        return direction_family(self.dx, self.dy)
+
+
+    @property
+    def backwards(self) -> bool:
+        """True when the word reads right-to-left or bottom-to-top."""
+        return self.dx < 0 or (self.dx == 0 and self.dy < 0)
+
+
+
+@dataclass(frozen=True, slots=True)
+class PuzzleResult:
+    """Finished puzzle, frozen and compact: the grid is one ``size * size`` string.
+
+    Python stores an all-ASCII string at one byte per letter, and any other
+    letter (e.g. from "café") still fits.
+
+    This is what books keep around until the solution pages are drawn, so it
+    holds no RNG or mutable grid; rows and paths are rebuilt on demand.
+    """
+    size: int
+    grid: str
+    placements: Tuple[PlacedWord, ...]
+    seed: Optional[int] = None
+
+
+    @property
+    def words(self) -> List[str]:
+        return [placed.word for placed in self.placements]
+
+
+    def letter(self, x: int, y: int) -> str:
+        return self.grid[y * self.size + x]
+
+
+    def as_rows(self) -> List[str]:
+        size = self.size
+        return [self.grid[y * size:(y + 1) * size] for y in range(size)]
+
+
+    def solution_coords(self) -> Set[Tuple[int, int]]:
+        result: Set[Tuple[int, int]] = set()
+        for placed in self.placements:
+            result.update(placed.path)
+        return result
+
+
+    def to_bytes(self) -> bytes:
+        """Serialize for spooling: header, UTF-8 grid, then one record per placement."""
+        grid = self.grid.encode("utf-8")
+        parts = [
+            _RESULT_HEADER.pack(self.size, self.seed is not None, self.seed or 0, len(self.placements), len(grid)),
+            grid,
+        ]
+        for placed in self.placements:
+            word = placed.word.encode("utf-8")
+            parts.append(_PLACEMENT_RECORD.pack(len(word), placed.x, placed.y, placed.dx, placed.dy))
+            parts.append(word)
+        return b"".join(parts)
+
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PuzzleResult":
+        size, has_seed, seed, count, grid_bytes = _RESULT_HEADER.unpack_from(data, 0)
+        offset = _RESULT_HEADER.size
+        grid = data[offset:offset + grid_bytes].decode("utf-8")
+        offset += grid_bytes
+        placements = []
+        for _ in range(count):
+            length, x, y, dx, dy = _PLACEMENT_RECORD.unpack_from(data, offset)
+            offset += _PLACEMENT_RECORD.size
+            word = data[offset:offset + length].decode("utf-8")
+            offset += length
+            placements.append(PlacedWord(word, x, y, dx, dy))
+        return cls(size, grid, tuple(placements), seed if has_seed else None)
+
+
+_RESULT_HEADER = struct.Struct("<H?qHI")
+_PLACEMENT_RECORD = struct.Struct("<BBBbb")
 
 
 
@@ -36,6 +326,18 @@ class WordSearchPuzzle:
     size: int
     words: List[str]
     seed: Optional[int] = None
+    fill_mode: str = "random"
+    banned_words: Sequence[str] = ()
+    letter_weights: Optional[Dict[str, float]] = None
+    directions: Sequence[Direction] = DIRECTIONS
+    placement: str = "length"
+    # Part of every RNG stream key, so two themes never share streams.
+    theme: str = ""
+    budget: Optional[Budget] = None
+    # Leave out words that cannot be placed (keeping at least ``min_words``)
+    # instead of failing the whole puzzle.
+    drop_unplaceable: bool = False
+    min_words: int = 0
 
 
     grid: List[List[str]] = field(init=False)
@@ -50,10 +352,24 @@ class WordSearchPuzzle:
     def __post_init__(self) -> None:
         # Normalize words (uppercase, no spaces)
         self.words = [w.upper().replace(" ", "") for w in self.words]
+        if self.fill_mode not in FILL_MODES:
+            raise ValueError(f"Unknown fill mode: {self.fill_mode!r} (expected one of {FILL_MODES})")
+        if self.placement not in PLACEMENT_MODES:
+            raise ValueError(f"Unknown placement: {self.placement!r} (expected one of {PLACEMENT_MODES})")
         # Empty grid size x size
         self.grid = [["" for _ in range(self.size)] for _ in range(self.size)]
         self.placements = []
-        self.random = random.Random(self.seed)
+        self.dropped: List[str] = []
+        # Constrained filler cells where no letter avoided a forbidden word.
+        self.unsafe_cells = 0
+        # Free-run index, built once a word needed FREE_INDEX_AFTER lines:
+        # per direction of DIRECTIONS and cell (y * size + x), how many empty
+        # cells start there, up to the first letter or the border. Kept up to
+        # date by _commit; the filler does not maintain it.
+        self._free: Optional[List[List[int]]] = None
+        self._line_runs: List[Tuple[List[int], List[int], int]] = []
+        # Without a seed, draw one so all streams of this puzzle still agree.
+        self._stream_seed = self.seed if self.seed is not None else random.getrandbits(63)
 
 
         # Direction usage counters for balanced layout
@@ -62,193 +378,409 @@ class WordSearchPuzzle:
         self.diagonal_used = 0
 
 
+    def stream(self, phase: str, index: Optional[int] = None) -> random.Random:
+        """RNG stream for one phase ("strict", "fallback", "fill"), per word index if given.
+
+        Word streams are keyed by the word's position in ``words``, not by the
+        placement order, so reordering or dropping words leaves the others'
+        draws unchanged.
+        """
+        if index is None:
+            return derive_rng(self._stream_seed, self.theme, phase)
+        return derive_rng(self._stream_seed, self.theme, phase, index)
+
+
     def _dir_family(self, dx: int, dy: int) -> str:
-        if dy == 0 and dx != 0:
-            return "H"  # horizontal
-        if dx == 0 and dy != 0:
-            return "V"  # vertical
-        if dx != 0 and dy != 0:
-            return "D"  # diagonal
-        return "H"
+        return direction_family(dx, dy)
 
 
     def generate(self, max_attempts: int = 300) -> None:
-        """Generate puzzle with GUARANTEED mix of H/V/D directions."""
+        """Generate puzzle with GUARANTEED mix of H/V/D directions.
+
+        Raises FillFailed (a RuntimeError) when constrained filler cannot
+        avoid a forbidden word, so callers can retry with another seed and
+        still tell it apart from a failed placement.
+        """
+        self.place_words(max_attempts)
+
+        # Fill remaining cells with random letters
+        if self.fill_mode == "constrained":
+            self._fill_constrained_letters()
+            if self.unsafe_cells:
+                raise FillFailed(f"Constrained filler spelled a forbidden word in {self.unsafe_cells} cells")
+        else:
+            self._fill_random_letters()
+
+
+    def place_words(self, max_attempts: int = 300) -> None:
+        """Place every word, raising RuntimeError when one does not fit.
+
+        With ``drop_unplaceable`` a word that does not fit is left out (and
+        once the budget is spent, every word not placed yet), as long as
+        ``min_words`` words end up in the grid.
+
+        ``max_attempts`` is kept for callers: each word now tries every line
+        that fits the grid once, in random order, which is exhaustive.
+        """
         
         # Split words into 3 groups for forced direction distribution
-        sorted_words = sorted(self.words, key=len, reverse=True)
+        # (word indices, longest words first)
+        sorted_words = sorted(range(len(self.words)), key=lambda i: len(self.words[i]), reverse=True)
         total = len(sorted_words)
         
         # Force distribution: ~40% diagonal, ~30% horizontal, ~30% vertical
-        num_diagonal = max(1, (total * 2) // 5)
+        # (no diagonal group when the direction set has no diagonals)
+        has_diagonal = any(self._dir_family(*d) == "D" for d in self.directions)
+        num_diagonal = max(1, (total * 2) // 5) if has_diagonal else 0
         num_horizontal = max(1, (total - num_diagonal) // 2)
-        num_vertical = total - num_diagonal - num_horizontal
         
         # Assign words to direction groups (longest words get diagonals for better fill)
         diagonal_words = sorted_words[:num_diagonal]
         horizontal_words = sorted_words[num_diagonal:num_diagonal + num_horizontal]
         vertical_words = sorted_words[num_diagonal + num_horizontal:]
         
-        # Place each group with STRICT direction enforcement
-        for word in diagonal_words:
-            placed = self._place_word_strict(word, "D", max_attempts)
-            if not placed:
-                # Fallback: try any direction if strict fails
-                placed = self._place_word(word, max_attempts)
+        words = self.words
+        assigned = ([(words[i], "D", i) for i in diagonal_words]
+                    + [(words[i], "H", i) for i in horizontal_words]
+                    + [(words[i], "V", i) for i in vertical_words])
+        if self.placement == "crossing":
+            assigned = self._crossing_order(assigned)
+
+        # Place each word with STRICT direction enforcement
+        for idx, (word, family, index) in enumerate(assigned):
+            try:
+                placed = self._place_word_strict(word, family, self.stream("strict", index))
+                if not placed:
+                    # Fallback: try any direction if strict fails
+                    placed = self._place_word(word, self.stream("fallback", index), skip_family=family)
+            except BudgetExceeded:
+                if not self.drop_unplaceable:
+                    raise
+                self.dropped.extend(remaining for remaining, _, _ in assigned[idx:])
+                break
             if not placed:
-                raise RuntimeError(f"Unable to place word: {word}")
-        
-        for word in horizontal_words:
-            placed = self._place_word_strict(word, "H", max_attempts)
-            if not placed:
-                placed = self._place_word(word, max_attempts)
-            if not placed:
-                raise RuntimeError(f"Unable to place word: {word}")
-        
-        for word in vertical_words:
-            placed = self._place_word_strict(word, "V", max_attempts)
-            if not placed:
-                placed = self._place_word(word, max_attempts)
-            if not placed:
-                raise RuntimeError(f"Unable to place word: {word}")
-        
-        # Fill remaining cells with random letters
-        self._fill_random_letters()
-
-
-    def _place_word_strict(self, word: str, required_family: str, max_attempts: int) -> bool:
-        """Place word using ONLY directions from specified family (H/V/D)."""
-        coords = [(x, y) for x in range(self.size) for y in range(self.size)]
-        
+                if not self.drop_unplaceable:
+                    raise RuntimeError(f"Unable to place word: {word}")
+                self.dropped.append(word)
+
+        if self.dropped and len(self.placements) < self.min_words:
+            raise RuntimeError(f"Only {len(self.placements)} of {len(self.words)} words placed")
+
+
+    def _crossing_order(self, assigned: Sequence[Tuple[str, str, int]]) -> List[Tuple[str, str, int]]:
+        """Greedy placement order: length plus crossing potential.
+
+        A word's potential is, per letter, the share of the theme's copies of
+        that letter already in placed words. Rare letters reach a high share
+        after a single placed copy, so words that can cross earlier words on a
+        rare letter move up while those crossing spots are still free.
+        """
+        frequency = Counter("".join(word for word, _, _ in assigned))
+        placed: Counter = Counter()
+        remaining = list(assigned)  # longest first: ties keep length order
+        order: List[Tuple[str, str, int]] = []
+        while remaining:
+            best = max(remaining, key=lambda item: len(item[0]) + sum(placed[ch] / frequency[ch] for ch in item[0]))
+            remaining.remove(best)
+            order.append(best)
+            placed.update(best[0])
+        return order
+
+
+    def _best_spot(self, word: str, lines: Iterable[Line]) -> Optional[Tuple[int, int, int, int, List[Tuple[int, int]]]]:
+        """First free line, or in crossing mode the most overlapping of the first few."""
+        best = None
+        best_crossings = -1
+        found = 0
+        free = self._free
+        grid = self.grid
+        size = self.size
+        length = len(word)
+        for tried, (start_x, start_y, dx, dy) in enumerate(lines):
+            if self.budget is not None:
+                self.budget.spend()
+            if free is None and tried == FREE_INDEX_AFTER:
+                # Sparse grids accept a line within a few tries; the index
+                # pays for its upkeep once lines get rejected often.
+                self._build_free()
+                free = self._free
+            if free is not None:
+                # Most lines are rejected by the first letter after the empty
+                # run at their start: check it here before the full walk.
+                i = free[DIRECTION_INDEX[(dx, dy)]][start_y * size + start_x]
+                if i < length and grid[start_y + dy * i][start_x + dx * i] != word[i]:
+                    continue
+            crossings = self._fit(start_x, start_y, dx, dy, word)
+            if crossings < 0:
+                continue
+            if self.placement != "crossing":
+                return start_x, start_y, dx, dy, self._line_cells(start_x, start_y, dx, dy, len(word))
+            if crossings > best_crossings:
+                best, best_crossings = (start_x, start_y, dx, dy), crossings
+            found += 1
+            if found >= CROSSING_CANDIDATES:
+                break
+        if best is None:
+            return None
+        return (*best, self._line_cells(*best, len(word)))
+
+
+    def free_run(self, x: int, y: int, dx: int, dy: int) -> int:
+        """Empty cells from (x, y) along (dx, dy); a word of that length or
+        shorter fits there without touching any letter."""
+        if self._free is None:
+            self._build_free()
+        return self._free[DIRECTION_INDEX[(dx, dy)]][y * self.size + x]
+
+
+    def _fit(self, x: int, y: int, dx: int, dy: int, word: str) -> int:
+        """Letters of ``word`` already in the grid on this in-grid line, or -1 on a clash.
+
+        Once the free-run index exists only occupied cells are compared: it
+        jumps over each stretch of empty cells.
+        """
+        grid = self.grid
+        if self._free is None:
+            crossings = 0
+            for letter in word:
+                cell = grid[y][x]
+                if cell:
+                    if cell != letter:
+                        return -1
+                    crossings += 1
+                x += dx
+                y += dy
+            return crossings
+
+        free = self._free[DIRECTION_INDEX[(dx, dy)]]
+        size = self.size
+        length = len(word)
+        i = free[y * size + x]
+        crossings = 0
+        while i < length:
+            cx, cy = x + dx * i, y + dy * i
+            if grid[cy][cx] != word[i]:
+                return -1
+            crossings += 1
+            i += 1
+            if i < length:
+                i += free[(cy + dy) * size + cx + dx]
+        return crossings
+
+
+    @staticmethod
+    def _line_cells(x: int, y: int, dx: int, dy: int, length: int) -> List[Tuple[int, int]]:
+        return [(x + dx * i, y + dy * i) for i in range(length)]
+
+
+    def _commit(self, word: str, start_x: int, start_y: int, dx: int, dy: int, path: List[Tuple[int, int]]) -> None:
+        # Commit letters into grid
+        for (x, y), letter in zip(path, word):
+            if not self.grid[y][x]:
+                self.grid[y][x] = letter
+                if self._free is not None:
+                    self._close_cell(x, y)
+
+        fam = self._dir_family(dx, dy)
+        self.placements.append(PlacedWord(word, start_x, start_y, dx, dy))
+
+        if fam == "H":
+            self.horizontal_used += 1
+        elif fam == "V":
+            self.vertical_used += 1
+        elif fam == "D":
+            self.diagonal_used += 1
+
+
+    def _place_word_strict(self, word: str, required_family: str, rng: random.Random) -> bool:
+        """Place word using ONLY directions from specified family (H/V/D).
+
+        Lines are drawn uniformly from those that fit inside the grid, each at
+        most once, so a single pass tells whether the word fits at all.
+        """
         # Filter directions to only the required family
-        allowed_dirs = [d for d in DIRECTIONS if self._dir_family(*d) == required_family]
-        
-        for _ in range(max_attempts):
-            self.random.shuffle(coords)
-            self.random.shuffle(allowed_dirs)
-            
-            for (start_x, start_y) in coords:
-                for dx, dy in allowed_dirs:
-                    path = self._preview_path(start_x, start_y, dx, dy, word)
-                    if not path:
-                        continue
-                    
-                    # Commit letters into grid
-                    for (x, y), letter in zip(path, word):
-                        self.grid[y][x] = letter
-                    
-                    fam = self._dir_family(dx, dy)
-                    self.placements.append(PlacedWord(word, path, fam))
-                    
-                    if fam == "H":
-                        self.horizontal_used += 1
-                    elif fam == "V":
-                        self.vertical_used += 1
-                    elif fam == "D":
-                        self.diagonal_used += 1
-                    
-                    return True
-        
+        allowed_dirs = tuple(d for d in self.directions if self._dir_family(*d) == required_family)
+        if not allowed_dirs:
+            return False
+
+        spot = self._best_spot(word, draw_lines(valid_lines(self.size, len(word), allowed_dirs), rng))
+        if spot:
+            self._commit(word, *spot)
+            return True
         return False
 
 
-    def _place_word(self, word: str, max_attempts: int) -> bool:
-        """Fallback: place word using any available direction."""
-        coords = [(x, y) for x in range(self.size) for y in range(self.size)]
-
-
-        for _ in range(max_attempts):
-            self.random.shuffle(coords)
-            directions = list(DIRECTIONS)
-            self.random.shuffle(directions)
-
-
-            usage = {
-                "H": self.horizontal_used,
-                "V": self.vertical_used,
-                "D": self.diagonal_used,
-            }
-
-
-            def _priority(direction: Direction) -> Tuple[int, int]:
-                fam = self._dir_family(*direction)
-                # Prefer least-used direction family
-                if fam == "D":
-                    fam_tier = 0
-                elif fam == "V":
-                    fam_tier = 1
-                else:
-                    fam_tier = 2
-                return fam_tier, usage[fam]
-
-
-            directions.sort(key=_priority)
-
-
-            for (start_x, start_y) in coords:
-                for dx, dy in directions:
-                    path = self._preview_path(start_x, start_y, dx, dy, word)
-                    if not path:
-                        continue
-
-
-                    # Commit letters into grid
-                    for (x, y), letter in zip(path, word):
-                        self.grid[y][x] = letter
-
-
-                    fam = self._dir_family(dx, dy)
-                    self.placements.append(PlacedWord(word, path, fam))
-
-
-                    if fam == "H":
-                        self.horizontal_used += 1
-                    elif fam == "V":
-                        self.vertical_used += 1
-                    elif fam == "D":
-                        self.diagonal_used += 1
-
-
-                    return True
-
-
+    def _place_word(self, word: str, rng: random.Random, skip_family: Optional[str] = None) -> bool:
+        """Fallback: place word using any available direction.
+
+        Diagonal lines are tried first, then vertical, then horizontal, each
+        tier in random order. Lines of ``skip_family`` were all just tried by
+        the strict pass on the same grid, so they are left out.
+        """
+        tiers = [
+            tuple(d for d in self.directions if self._dir_family(*d) == fam)
+            for fam in ("D", "V", "H")
+            if fam != skip_family
+        ]
+        lines = chain.from_iterable(
+            draw_lines(valid_lines(self.size, len(word), dirs), rng) for dirs in tiers if dirs
+        )
+        spot = self._best_spot(word, lines)
+        if spot:
+            self._commit(word, *spot)
+            return True
         return False
 
 
-    def _preview_path(
-        self,
-        x: int,
-        y: int,
-        dx: int,
-        dy: int,
-        word: str,
-    ) -> Optional[List[Tuple[int, int]]]:
-        path: List[Tuple[int, int]] = []
-
-
-        for letter in word:
-            if not (0 <= x < self.size and 0 <= y < self.size):
-                return None
-
-
-            cell = self.grid[y][x]
-            if cell not in ("", letter):
-                return None
-
-
-            path.append((x, y))
-            x += dx
-            y += dy
-
-
-        return path
+    def _build_free(self) -> None:
+        size = self.size
+        grid = self.grid
+        self._free = []
+        for dx, dy in DIRECTIONS:
+            runs = [0] * (size * size)
+            # Visit each cell after the next one along (dx, dy).
+            for y in (range(size - 1, -1, -1) if dy > 0 else range(size)):
+                for x in (range(size - 1, -1, -1) if dx > 0 else range(size)):
+                    if grid[y][x]:
+                        continue
+                    nx, ny = x + dx, y + dy
+                    runs[y * size + x] = 1 + (runs[ny * size + nx] if 0 <= nx < size and 0 <= ny < size else 0)
+            self._free.append(runs)
+        # One (ahead, behind, flat index step) per line orientation.
+        self._line_runs = [
+            (self._free[DIRECTION_INDEX[(dx, dy)]], self._free[DIRECTION_INDEX[(-dx, -dy)]], dy * size + dx)
+            for dx, dy in SCAN_DIRECTIONS
+        ]
+
+
+    def _close_cell(self, x: int, y: int) -> None:
+        """Update the free runs after the empty cell (x, y) got a letter.
+
+        On each line through it only the empty cells on either side had runs
+        reaching this cell. The opposite run from (x, y) says how many there
+        are, and their runs become 1, 2, ... moving away from it.
+        """
+        idx = y * self.size + x
+        for ahead, behind, step in self._line_runs:
+            before = behind[idx] - 1  # empty cells before idx, their runs go ahead
+            after = ahead[idx] - 1    # empty cells after idx, their runs go back
+            if before:
+                ahead[idx - step * before:idx:step] = range(before, 0, -1)
+            if after:
+                behind[idx + step:idx + step * after + 1:step] = range(1, after + 1)
+            ahead[idx] = behind[idx] = 0
 
 
     def _fill_random_letters(self) -> None:
+        rng = self.stream("fill")
+        if self.letter_weights:
+            letters, cum_weights = self._letter_table()
+            for y in range(self.size):
+                for x in range(self.size):
+                    if not self.grid[y][x]:
+                        self.grid[y][x] = rng.choices(letters, cum_weights=cum_weights)[0]
+            return
+
         for y in range(self.size):
             for x in range(self.size):
                 if not self.grid[y][x]:
-                    self.grid[y][x] = self.random.choice(string.ascii_uppercase)
+                    self.grid[y][x] = rng.choice(string.ascii_uppercase)
+
+
+    def _letter_table(self) -> Tuple[List[str], List[float]]:
+        """Letters and cumulative weights for filler sampling."""
+        weights = self.letter_weights or {}
+        letters: List[str] = []
+        cum_weights: List[float] = []
+        total = 0.0
+        for letter in string.ascii_uppercase:
+            weight = weights.get(letter, 0.0) if weights else 1.0
+            if weight <= 0:
+                continue
+            total += weight
+            letters.append(letter)
+            cum_weights.append(total)
+        if not letters:
+            return list(string.ascii_uppercase), [float(i + 1) for i in range(26)]
+        return letters, cum_weights
+
+
+    def _fill_constrained_letters(self) -> None:
+        """Fill empty cells so no forbidden word appears through filler.
+
+        Forbidden words are the puzzle's own words plus ``banned_words``, in
+        both reading directions. Cells are filled in row-major order while an
+        automaton state is carried along the four line orientations, so each
+        candidate letter is checked against the partial lines through its cell
+        (and the run of already placed letters right after it) instead of
+        rescanning the grid. Matches made only of placed letters are the hidden
+        words themselves and are left alone.
+        """
+        forbidden = self.words + [w.upper().replace(" ", "") for w in self.banned_words]
+        automaton = WordAutomaton(forbidden + [w[::-1] for w in forbidden])
+        match_len = automaton.match_len
+        step = automaton.step
+
+        size = self.size
+        grid = self.grid
+        rng = self.stream("fill")
+        letters, cum_weights = self._letter_table()
+        weights = dict(zip(letters, (b - a for a, b in zip([0.0] + cum_weights, cum_weights))))
+
+        # Automaton state after each cell, per scan direction.
+        states = [array("i", [0]) * (size * size) for _ in SCAN_DIRECTIONS]
+
+        def _previous(d: int, x: int, y: int) -> int:
+            dx, dy = SCAN_DIRECTIONS[d]
+            px, py = x - dx, y - dy
+            if 0 <= px < size and 0 <= py < size:
+                return states[d][py * size + px]
+            return 0
+
+        def _letter_ok(x: int, y: int, letter: str, prev: List[int]) -> bool:
+            for d, (dx, dy) in enumerate(SCAN_DIRECTIONS):
+                state = step(prev[d], letter)
+                if match_len[state]:
+                    return False
+                # Look ahead through placed letters that follow on this line;
+                # a match of ``run`` letters or more would include this cell.
+                run = 1
+                nx, ny = x + dx, y + dy
+                while 0 <= nx < size and 0 <= ny < size and grid[ny][nx]:
+                    state = step(state, grid[ny][nx])
+                    run += 1
+                    if match_len[state] >= run:
+                        return False
+                    nx += dx
+                    ny += dy
+            return True
+
+        for y in range(size):
+            for x in range(size):
+                idx = y * size + x
+                prev = [_previous(d, x, y) for d in range(len(SCAN_DIRECTIONS))]
+                letter = grid[y][x]
+
+                if not letter:
+                    first = rng.choices(letters, cum_weights=cum_weights)[0]
+                    letter = first
+                    if not _letter_ok(x, y, first, prev):
+                        # Weighted random order over the remaining letters.
+                        others = sorted(
+                            (l for l in letters if l != first),
+                            key=lambda l: rng.random() ** (1.0 / weights[l]),
+                            reverse=True,
+                        )
+                        for candidate in others:
+                            if _letter_ok(x, y, candidate, prev):
+                                letter = candidate
+                                break
+                        else:
+                            self.unsafe_cells += 1  # every letter spells a forbidden word
+                    grid[y][x] = letter
+
+                for d in range(len(SCAN_DIRECTIONS)):
+                    states[d][idx] = step(prev[d], letter)
 
 
     def solution_coords(self) -> Set[Tuple[int, int]]:
@@ -260,3 +792,32 @@ class WordSearchPuzzle:
 
     def as_rows(self) -> List[str]:
         return ["".join(row) for row in self.grid]
+
+
+    def result(self) -> PuzzleResult:
+        """Freeze the generated puzzle into a compact PuzzleResult."""
+        return PuzzleResult(
+            size=self.size,
+            grid="".join(self.as_rows()),
+            placements=tuple(self.placements),
+            seed=self.seed,
+        )
+
+
+def scan_lines(size: int) -> List[List[Tuple[int, int]]]:
+    """Every full line of a ``size`` grid, once per orientation (see SCAN_DIRECTIONS)."""
+    lines: List[List[Tuple[int, int]]] = []
+    for dx, dy in SCAN_DIRECTIONS:
+        for y in range(size):
+            for x in range(size):
+                # Only start at cells with no predecessor on this line
+                if 0 <= x - dx < size and 0 <= y - dy < size:
+                    continue
+                line = []
+                cx, cy = x, y
+                while 0 <= cx < size and 0 <= cy < size:
+                    line.append((cx, cy))
+                    cx += dx
+                    cy += dy
+                lines.append(line)
+    return lines
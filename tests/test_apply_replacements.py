@@ -0,0 +1,16 @@
+from itertools import islice
+
+from src.apply_replacements import CandidatePool
+
+
+def test_candidates_skip_suffixes_that_do_not_fit_whole():
+    pool = CandidatePool(taken={"THERMOMETERFOUR"}, max_length=16)
+    candidates = list(islice(pool.candidates("thermometer", "Four Seasons"), 40))
+
+    assert candidates[0] == "thermometerfour"
+    assert all(len(candidate) <= 16 for candidate in candidates)
+    assert not any("seas" in candidate for candidate in candidates)
+    assert candidates[1:3] == ["thermometerfoura", "thermometerfourb"]
+
+    pool = CandidatePool(taken={"THERMOMETERFOUR", "THERMOMETERFOURA"}, max_length=16)
+    assert pool.claim("thermometer", "Four Seasons") == "thermometerfourb"
@@ -0,0 +1,18 @@
+from collections import Counter
+
+from src.compile_bank import normalize_word, validate
+from src.word_search import PuzzleResult, WordSearchPuzzle
+
+
+def test_validated_words_survive_the_grid():
+    issues = Counter()
+    entries = [{"theme": "Food", "words": ["crème brûlée", "jalapeño", "fish & chips", "  "]}]
+    [entry] = validate(entries, max_length=12, issues=issues)
+
+    assert entry["words"] == ["crème brûlée", "jalapeño"]
+    assert issues == Counter({"non-letter word": 1, "empty word": 1})
+
+    puzzle = WordSearchPuzzle(size=12, words=entry["words"], seed=3)
+    puzzle.generate()
+    restored = PuzzleResult.from_bytes(puzzle.result().to_bytes())
+    assert sorted(restored.words) == sorted(normalize_word(word) for word in entry["words"])
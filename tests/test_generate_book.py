@@ -0,0 +1,26 @@
+from collections import Counter
+
+from src import generate_book
+from src.puzzle_bank import PUZZLES
+
+
+def test_rebuild_puzzle_matches_book_across_passes():
+    # More puzzles than themes: the book has to go back over the bank.
+    book = generate_book.build_puzzles(len(PUZZLES) + 5, 16, 42)
+    assert max(data["source_index"] for data, _ in book) > len(PUZZLES)
+
+    for data, puzzle in book:
+        rebuilt = generate_book.rebuild_puzzle(data["source_index"], 16, 42)
+        assert rebuilt is not None
+        rebuilt_data, rebuilt_puzzle = rebuilt
+        assert rebuilt_data == data
+        assert rebuilt_puzzle.to_bytes() == puzzle.to_bytes()
+
+
+def test_book_op_budget_stops_the_build(monkeypatch):
+    monkeypatch.setitem(generate_book.CONFIG.data["puzzle_generation"], "book_op_budget", 20000)
+    outcomes = Counter()
+    book = generate_book.build_puzzles(len(PUZZLES), 16, 42, outcomes=outcomes)
+
+    assert 0 < len(book) < len(PUZZLES)
+    assert outcomes["book_budget_exceeded"] == 1
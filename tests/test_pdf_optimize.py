@@ -0,0 +1,22 @@
+import os
+import stat
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from src.pdf_optimize import optimize_pdf
+
+pytest.importorskip("pypdf", minversion="5.0")
+
+
+def test_optimize_keeps_file_mode(tmp_path):
+    pdf = tmp_path / "book.pdf"
+    c = canvas.Canvas(str(pdf))
+    c.drawString(72, 72, "Word search")
+    c.showPage()
+    c.save()
+    os.chmod(pdf, 0o644)
+
+    optimize_pdf(pdf)
+
+    assert stat.S_IMODE(pdf.stat().st_mode) == 0o644
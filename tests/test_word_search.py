@@ -0,0 +1,27 @@
+import string
+
+import pytest
+
+from src.word_search import FillFailed, PuzzleResult, WordSearchPuzzle
+
+
+def test_non_ascii_words_survive_freezing_and_spooling():
+    puzzle = WordSearchPuzzle(size=10, words=["café", "señor", "niño", "piñata"], seed=7)
+    puzzle.generate()
+
+    result = puzzle.result()
+    assert result.as_rows() == ["".join(row) for row in puzzle.grid]
+    assert sorted(result.words) == ["CAFÉ", "NIÑO", "PIÑATA", "SEÑOR"]
+    for placed in result.placements:
+        assert "".join(result.letter(x, y) for x, y in placed.path) == placed.word
+
+    restored = PuzzleResult.from_bytes(result.to_bytes())
+    assert restored == result
+
+
+def test_constrained_fill_reports_unavoidable_banned_words():
+    puzzle = WordSearchPuzzle(size=6, words=["CAT"], seed=1, fill_mode="constrained",
+                              banned_words=list(string.ascii_uppercase))
+    with pytest.raises(FillFailed):
+        puzzle.generate()
+    assert puzzle.unsafe_cells > 0
@@ -10,6 +10,7 @@ from user_preferences import UserPreferences
 
 # CRITICAL FIX: Import PDF generation directly instead of subprocess
 from src.generate_book import generate_pdf
+from src.fonts import store_font_bytes
 
 # Ensure folders exist
 Path("images").mkdir(exist_ok=True)
@@ -418,11 +419,9 @@ with left:
             st.info("📝 Current: Biski")
             uploaded_font = st.file_uploader("Upload (.ttf, .otf)", type=["ttf", "otf"], key="font_upload")
             if uploaded_font is not None:
-                font_bytes = uploaded_font.read()
-                font_save_path = f"fonts/{uploaded_font.name}"
-                with open(font_save_path, "wb") as f:
-                    f.write(font_bytes)
-                font_path = font_save_path
+                # Stored by content hash: re-uploads and reruns don't write again
+                font_path = str(store_font_bytes(uploaded_font.getvalue(), Path("fonts"),
+                                                 Path(uploaded_font.name).suffix))
                 st.success(f"✅ {uploaded_font.name}")
             else:
                 font_path = config.get('general', 'font_path')